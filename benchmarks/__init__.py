@@ -0,0 +1 @@
+"""Offline record/replay benchmarks for the demos."""
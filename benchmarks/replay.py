@@ -0,0 +1,230 @@
+"""
+Record/replay stand-ins for the cloud services used by the demos
+
+Recorded responses live in benchmarks/fixtures/ as JSON. Replaying them lets
+the demos run without DeepSeek or Huawei Cloud credentials, with a
+configurable injected latency in place of the real network round trip.
+
+- ReplayHTTP.post replaces requests.post for the DeepSeek chat API
+- ReplayImageClient replaces the Huawei Cloud ImageClient
+- ReplayOcrClient replaces the Huawei Cloud OcrClient
+- record_deepseek() refreshes the DeepSeek fixture from the live API
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+DEEPSEEK_FIXTURE = os.path.join(FIXTURES_DIR, 'deepseek_responses.json')
+IMAGE_TAGGING_FIXTURE = os.path.join(FIXTURES_DIR, 'image_tagging_response.json')
+OCR_FIXTURE = os.path.join(FIXTURES_DIR, 'ocr_general_text_response.json')
+
+
+def load_fixture(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class LatencyModel:
+    """
+    Injected latency for replayed calls.
+
+    Args:
+        mean_ms (float): Mean delay in milliseconds; 0 disables the delay
+        distribution (str): 'fixed', 'lognormal' (long tail, like real API
+            latency) or 'recorded' (the latency stored in the fixture)
+        sigma (float): Shape of the lognormal distribution
+        seed (int): Seed for repeatable delays
+        scale (float): Multiplier applied to recorded latencies
+    """
+
+    def __init__(self, mean_ms=0.0, distribution='fixed', sigma=0.5, seed=0, scale=1.0):
+        if distribution not in ('fixed', 'lognormal', 'recorded'):
+            raise ValueError(f"Unknown latency distribution '{distribution}'")
+        self.mean_ms = mean_ms
+        self.distribution = distribution
+        self.sigma = sigma
+        self.scale = scale
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_ms(self, recorded_ms=None):
+        """Return the delay for one call in milliseconds."""
+        if self.distribution == 'recorded':
+            return (recorded_ms if recorded_ms is not None else self.mean_ms) * self.scale
+        if not self.mean_ms:
+            return 0.0
+        if self.distribution == 'lognormal':
+            # Pick mu so the distribution's mean equals mean_ms
+            mu = math.log(self.mean_ms) - self.sigma ** 2 / 2
+            with self._lock:
+                return self._random.lognormvariate(mu, self.sigma)
+        return self.mean_ms
+
+    def wait(self, recorded_ms=None):
+        delay = self.sample_ms(recorded_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        return delay
+
+
+class ReplayResponse:
+    """Minimal requests.Response replacement."""
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+        self.content = json.dumps(body).encode('utf-8')
+        self.text = self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} replayed error", response=self)
+
+
+class ReplayHTTP:
+    """
+    Replays recorded DeepSeek chat completions, keyed by the user question.
+
+    Use `post` in place of requests.post, e.g. with
+    unittest.mock.patch.object(demo.requests, 'post', replay.post).
+
+    Args:
+        fixture_path (str): DeepSeek fixture file
+        latency (LatencyModel): Injected delay per call
+        strict (bool): Raise KeyError for unknown questions instead of
+            replaying the first recorded response
+    """
+
+    def __init__(self, fixture_path=DEEPSEEK_FIXTURE, latency=None, strict=True):
+        fixture = load_fixture(fixture_path)
+        self.responses = {entry['question']: entry for entry in fixture['responses']}
+        self.latency = latency or LatencyModel()
+        self.strict = strict
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def questions(self):
+        return list(self.responses)
+
+    def post(self, url, headers=None, json=None, **kwargs):
+        question = json['messages'][-1]['content'] if json else None
+        entry = self.responses.get(question)
+        if entry is None:
+            if self.strict:
+                raise KeyError(f"No recorded response for question: {question!r}")
+            entry = next(iter(self.responses.values()))
+        with self._lock:
+            self.calls += 1
+        self.latency.wait(entry.get('recorded_latency_ms'))
+        return ReplayResponse(entry['status_code'], entry['body'])
+
+
+def _namespace(value):
+    """Convert nested dicts/lists into attribute-access objects like SDK models."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_namespace(item) for item in value]
+    return value
+
+
+class _ReplayResponse:
+
+    def __init__(self, body):
+        self._body = body
+        self.result = _namespace(body.get('result'))
+
+    def to_dict(self):
+        return json.loads(json.dumps(self._body))
+
+
+class ReplayImageClient:
+    """Replays a recorded run_image_tagging response."""
+
+    def __init__(self, fixture_path=IMAGE_TAGGING_FIXTURE, latency=None):
+        self.fixture = load_fixture(fixture_path)
+        self.latency = latency or LatencyModel()
+        self.calls = 0
+
+    def run_image_tagging(self, request):
+        self.calls += 1
+        self.latency.wait(self.fixture.get('recorded_latency_ms'))
+        return _ReplayResponse(self.fixture['response'])
+
+
+class ReplayOcrClient:
+    """Replays a recorded recognize_general_text response."""
+
+    def __init__(self, fixture_path=OCR_FIXTURE, latency=None):
+        self.fixture = load_fixture(fixture_path)
+        self.latency = latency or LatencyModel()
+        self.calls = 0
+
+    def recognize_general_text(self, request):
+        self.calls += 1
+        self.latency.wait(self.fixture.get('recorded_latency_ms'))
+        return _ReplayResponse(self.fixture['response'])
+
+
+def record_deepseek(questions, api_key, fixture_path=DEEPSEEK_FIXTURE):
+    """
+    Call the live DeepSeek API for each question and save the responses.
+
+    Uses the same system prompt as deepseek-sql/demo.py by capturing the
+    request generate_sql() builds.
+
+    Args:
+        questions (list): Natural language questions to record
+        api_key (str): DeepSeek API key
+        fixture_path (str): Fixture file to write
+
+    Returns:
+        list: Questions that failed and were left out of the fixture
+    """
+    import sys
+    import requests
+    from unittest.mock import patch
+
+    demo_dir = os.path.join(os.path.dirname(os.path.dirname(FIXTURES_DIR)), 'deepseek-sql')
+    if demo_dir not in sys.path:
+        sys.path.insert(0, demo_dir)
+    import demo
+
+    recorded = []
+
+    def recording_post(url, headers=None, json=None, **kwargs):
+        start = time.perf_counter()
+        response = requests.Session().post(url, headers=headers, json=json, **kwargs)
+        recorded.append({
+            'question': json['messages'][-1]['content'],
+            'status_code': response.status_code,
+            'body': response.json(),
+            'recorded_latency_ms': round((time.perf_counter() - start) * 1000),
+        })
+        return response
+
+    failed = []
+    with patch.object(demo, 'DEEPSEEK_API_KEY', api_key), patch.object(demo.requests, 'post', recording_post):
+        for question in questions:
+            count = len(recorded)
+            try:
+                demo.generate_sql(question)
+            except SystemExit:
+                # generate_sql() exits on API errors; keep the other recordings
+                del recorded[count:]
+                failed.append(question)
+
+    with open(fixture_path, 'w', encoding='utf-8') as f:
+        json.dump({'endpoint': 'https://api.deepseek.com/chat/completions', 'responses': recorded}, f, indent=2)
+    return failed
@@ -0,0 +1,254 @@
+"""
+Offline benchmark suite for the demos
+
+Runs every demo entry point against recorded fixtures instead of the live
+services: DeepSeek responses are replayed through ReplayHTTP, Huawei Cloud
+calls through ReplayImageClient/ReplayOcrClient, MySQL is replaced by a seeded
+SQLite `telegram.articles` table and downloads hit a local HTTP server.
+
+For each benchmark the suite reports throughput, latency percentiles and
+peak Python memory (tracemalloc, measured in a separate pass so it does not
+slow down the timed runs). Results can be saved as JSON and compared with a
+previous run to catch regressions.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks [--latency-ms 0] [--iterations 200]
+        [--only nl2sql_pipeline,execute_query] [--json results.json]
+        [--baseline baseline.json] [--tolerance 0.25]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import patch
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for subdir in ('orc_demo', 'image_recognition_demo', 'deepseek-sql', ''):
+    path = os.path.join(REPO_ROOT, subdir)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from benchmarks.replay import LatencyModel, ReplayHTTP, ReplayImageClient, ReplayOcrClient
+from benchmarks.sqlite_articles import create_articles_db
+
+SAMPLE_IMAGE = os.path.join(REPO_ROOT, 'image_recognition_demo', 'sample.jpg')
+OCR_IMAGE = os.path.join(REPO_ROOT, 'orc_demo', 'test_image.jpg')
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(name, func, iterations, warmup=3, memory_iterations=20):
+    """
+    Time `func(i)` for `iterations` calls and measure its peak memory.
+
+    Returns:
+        dict: Benchmark result row
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(warmup):
+            func(i)
+
+        latencies = []
+        start = time.perf_counter()
+        for i in range(iterations):
+            call_start = time.perf_counter()
+            func(i)
+            latencies.append(time.perf_counter() - call_start)
+        total = time.perf_counter() - start
+
+        tracemalloc.start()
+        try:
+            for i in range(min(iterations, memory_iterations)):
+                func(i)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'name': name,
+        'iterations': iterations,
+        'throughput_ops_s': iterations / total if total else 0.0,
+        'latency_mean_ms': sum(latencies) / len(latencies) * 1000,
+        'latency_p50_ms': percentile(latencies, 50) * 1000,
+        'latency_p95_ms': percentile(latencies, 95) * 1000,
+        'latency_p99_ms': percentile(latencies, 99) * 1000,
+        'peak_memory_kib': peak / 1024,
+    }
+
+
+class Suite:
+    """Holds the shared replay fixtures and defines one method per benchmark."""
+
+    def __init__(self, latency, rows, embedding_dim, seed):
+        import demo
+
+        self.demo = demo
+        self.latency = latency
+        self.replay = ReplayHTTP(latency=latency)
+        self.questions = self.replay.questions
+        self.connection = create_articles_db(rows=rows, embedding_dim=embedding_dim, seed=seed)
+        with patch.object(demo.requests, 'post', self.replay.post), \
+                open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            self.sql = [demo.generate_sql(question) for question in self.questions]
+        self.query_results = [demo.execute_query(self.connection, sql) for sql in self.sql]
+
+    def _question(self, i):
+        return self.questions[i % len(self.questions)]
+
+    def nl2sql_pipeline(self):
+        demo = self.demo
+
+        def run(i):
+            sql = demo.generate_sql(self._question(i))
+            columns, results = demo.execute_query(self.connection, sql)
+            demo.display_results(columns, results)
+        return run
+
+    def generate_sql(self):
+        return lambda i: self.demo.generate_sql(self._question(i))
+
+    def execute_query(self):
+        return lambda i: self.demo.execute_query(self.connection, self.sql[i % len(self.sql)])
+
+    def display_results(self):
+        def run(i):
+            columns, results = self.query_results[i % len(self.query_results)]
+            self.demo.display_results(columns, results)
+        return run
+
+    def recognize_image(self):
+        import image_recognition_demo
+
+        client = ReplayImageClient(latency=self.latency)
+        return lambda i: image_recognition_demo.print_results(
+            image_recognition_demo.recognize_image(client, SAMPLE_IMAGE))
+
+    def recognize_text_from_image(self):
+        import ocr_demo
+
+        client = ReplayOcrClient(latency=self.latency)
+        return lambda i: ocr_demo.print_ocr_result(ocr_demo.recognize_text_from_image(client, OCR_IMAGE))
+
+    def download_image(self):
+        from benchmark_downloader import start_server
+        import image_recognition_demo
+
+        serve_dir = tempfile.mkdtemp(prefix="bench_serve_")
+        out_dir = tempfile.mkdtemp(prefix="bench_out_")
+        shutil.copy(SAMPLE_IMAGE, os.path.join(serve_dir, 'sample.jpg'))
+        server, base_url = start_server(serve_dir, latency=self.latency.sample_ms() / 1000)
+        self._cleanup.append(server.shutdown)
+        self._cleanup.append(lambda: shutil.rmtree(serve_dir, ignore_errors=True))
+        self._cleanup.append(lambda: shutil.rmtree(out_dir, ignore_errors=True))
+        return lambda i: image_recognition_demo.download_image(f"{base_url}/sample.jpg",
+                                                               os.path.join(out_dir, 'sample.jpg'))
+
+    BENCHMARKS = ('nl2sql_pipeline', 'generate_sql', 'execute_query', 'display_results',
+                  'recognize_image', 'recognize_text_from_image', 'download_image')
+
+    def run(self, names, iterations):
+        self._cleanup = []
+        rows = []
+        try:
+            with patch.object(self.demo.requests, 'post', self.replay.post):
+                for name in names:
+                    print(f"Running {name}...", file=sys.stderr)
+                    rows.append(measure(name, getattr(self, name)(), iterations))
+        finally:
+            for cleanup in self._cleanup:
+                cleanup()
+        return rows
+
+
+def compare_with_baseline(rows, baseline_rows, tolerance):
+    """
+    Return a list of regression messages.
+
+    A benchmark regresses when its p50 latency or peak memory grows, or its
+    throughput drops, by more than `tolerance` (a fraction) versus the baseline.
+    """
+    baseline = {row['name']: row for row in baseline_rows}
+    regressions = []
+    for row in rows:
+        before = baseline.get(row['name'])
+        if not before:
+            continue
+        checks = (
+            ('latency_p50_ms', row['latency_p50_ms'] > before['latency_p50_ms'] * (1 + tolerance)),
+            ('throughput_ops_s', row['throughput_ops_s'] < before['throughput_ops_s'] / (1 + tolerance)),
+            ('peak_memory_kib', row['peak_memory_kib'] > before['peak_memory_kib'] * (1 + tolerance)),
+        )
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append(f"{row['name']}: {metric} {before[metric]:.3f} -> {row[metric]:.3f}")
+    return regressions
+
+
+def print_report(rows):
+    print(f"{'benchmark':<28} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>10}")
+    print("-" * 80)
+    for row in rows:
+        print(f"{row['name']:<28} {row['throughput_ops_s']:>10.1f} {row['latency_p50_ms']:>9.3f} "
+              f"{row['latency_p95_ms']:>9.3f} {row['latency_p99_ms']:>9.3f} {row['peak_memory_kib']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline record/replay benchmarks for the demos.")
+    parser.add_argument('--iterations', type=int, default=200, help="Timed calls per benchmark (default: 200)")
+    parser.add_argument('--only', help="Comma-separated benchmarks to run: " + ', '.join(Suite.BENCHMARKS))
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Injected latency per replayed call")
+    parser.add_argument('--distribution', default='fixed', choices=('fixed', 'lognormal', 'recorded'),
+                        help="Injected latency distribution (default: fixed)")
+    parser.add_argument('--rows', type=int, default=5000, help="Synthetic articles in SQLite (default: 5000)")
+    parser.add_argument('--embedding-dim', type=int, default=384, help="Embedding length (default: 384)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for synthetic data and latency")
+    parser.add_argument('--json', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare with results from a previous --json run")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed regression fraction (default: 0.25)")
+    args = parser.parse_args()
+
+    names = Suite.BENCHMARKS
+    if args.only:
+        names = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown = [name for name in names if name not in Suite.BENCHMARKS]
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    latency = LatencyModel(args.latency_ms, args.distribution, seed=args.seed)
+    suite = Suite(latency, args.rows, args.embedding_dim, args.seed)
+    rows = suite.run(names, args.iterations)
+
+    print(f"Benchmarks: {args.iterations} iterations, {args.latency_ms:g} ms {args.distribution} latency, "
+          f"{args.rows} articles")
+    print_report(rows)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': rows}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline_rows = json.load(f)['results']
+        regressions = compare_with_baseline(rows, baseline_rows, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
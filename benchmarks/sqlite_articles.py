@@ -0,0 +1,107 @@
+"""
+SQLite stand-in for the telegram.articles MySQL table
+
+The table is created in an attached database named `telegram`, so the
+generated queries (which always reference telegram.articles) run unchanged.
+Rows are synthetic but shaped like the real data: titles, descriptions and
+summaries built from a tech vocabulary, a handful of categories and sources,
+timestamps spread over two years and a JSON-encoded embedding vector per row.
+Generation is deterministic for a given seed.
+"""
+
+import datetime
+import json
+import random
+import sqlite3
+
+CATEGORIES = ['AI', 'Machine Learning', 'Cloud', 'DevOps', 'Security', 'Databases', 'Programming', 'Startups']
+SOURCES = ['telegram', 'hackernews', 'reddit', 'medium', 'arxiv', 'rss']
+TOPICS = ['deepseek', 'kubernetes', 'llm', 'postgres', 'mysql', 'rust', 'python', 'huawei cloud',
+          'transformers', 'ocr', 'vector search', 'serverless', 'gpu', 'observability', 'rag']
+WORDS = ['scaling', 'inference', 'latency', 'benchmark', 'release', 'guide', 'deep dive', 'production',
+         'open source', 'architecture', 'performance', 'cost', 'tutorial', 'lessons', 'migration']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS telegram.articles (
+    id INTEGER PRIMARY KEY,
+    title VARCHAR(255),
+    description TEXT,
+    url TEXT,
+    created_at TIMESTAMP,
+    category VARCHAR(64),
+    embedding TEXT,
+    user_id BIGINT,
+    summary TEXT,
+    notion_page_id VARCHAR(64),
+    modified_at TIMESTAMP,
+    source VARCHAR(64),
+    image_url TEXT
+)
+"""
+
+
+def _sentence(rng, topic, length):
+    words = [rng.choice(WORDS) for _ in range(length)]
+    words.insert(rng.randrange(len(words) + 1), topic)
+    return ' '.join(words).capitalize()
+
+
+def synthetic_rows(count, embedding_dim=384, seed=0):
+    """
+    Yield synthetic article rows as tuples in column order.
+
+    Args:
+        count (int): Number of rows
+        embedding_dim (int): Length of each embedding vector
+        seed (int): Random seed
+    """
+    rng = random.Random(seed)
+    start = datetime.datetime(2024, 1, 1)
+    for article_id in range(1, count + 1):
+        topic = rng.choice(TOPICS)
+        created = start + datetime.timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))
+        modified = created + datetime.timedelta(hours=rng.randrange(0, 72))
+        slug = topic.replace(' ', '-')
+        embedding = [round(rng.gauss(0.0, 0.05), 6) for _ in range(embedding_dim)]
+        yield (
+            article_id,
+            _sentence(rng, topic, rng.randint(3, 8)),
+            ' '.join(_sentence(rng, topic, rng.randint(8, 16)) + '.' for _ in range(rng.randint(2, 5))),
+            f"https://example.com/{slug}/{article_id}",
+            created.strftime('%Y-%m-%d %H:%M:%S'),
+            rng.choice(CATEGORIES),
+            json.dumps(embedding),
+            rng.choice([1001, 1002, 1003, 1004]),
+            _sentence(rng, topic, rng.randint(10, 25)) + '.',
+            f"{rng.getrandbits(128):032x}",
+            modified.strftime('%Y-%m-%d %H:%M:%S'),
+            rng.choice(SOURCES),
+            f"https://images.example.com/{article_id}.jpg" if rng.random() < 0.6 else '',
+        )
+
+
+def create_articles_db(path=':memory:', rows=5000, embedding_dim=384, seed=0, check_same_thread=True):
+    """
+    Create a connection whose `telegram.articles` table is seeded with synthetic rows.
+
+    Args:
+        path (str): SQLite file for the telegram database, ':memory:' by default
+        rows (int): Number of articles to insert (skipped if the table is already populated)
+        embedding_dim (int): Length of each embedding vector
+        seed (int): Random seed for the synthetic data
+        check_same_thread (bool): Passed to sqlite3.connect
+
+    Returns:
+        sqlite3.Connection: Connection usable with demo.execute_query()
+    """
+    connection = sqlite3.connect(':memory:', check_same_thread=check_same_thread)
+    connection.execute("ATTACH DATABASE ? AS telegram", (path,))
+    connection.execute(SCHEMA)
+    existing = connection.execute("SELECT COUNT(*) FROM telegram.articles").fetchone()[0]
+    if not existing and rows:
+        with connection:
+            connection.executemany(
+                "INSERT INTO telegram.articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                synthetic_rows(rows, embedding_dim, seed)
+            )
+    return connection
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'deepseek-sql'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import demo
+from benchmarks.replay import LatencyModel, ReplayHTTP, ReplayOcrClient, ReplayResponse, record_deepseek
+from benchmarks.sqlite_articles import create_articles_db
+
+
+class TestReplay(unittest.TestCase):
+
+    def test_recorded_questions_run_against_sqlite(self):
+        """Test that every recorded DeepSeek answer executes on the SQLite stand-in"""
+        replay = ReplayHTTP()
+        connection = create_articles_db(rows=200, embedding_dim=8)
+
+        with patch.object(demo.requests, 'post', replay.post):
+            for question in replay.questions:
+                sql = demo.generate_sql(question)
+                columns, results = demo.execute_query(connection, sql)
+                self.assertIsNotNone(columns, sql)
+                self.assertLessEqual(len(results), 5)
+
+        self.assertEqual(replay.calls, len(replay.questions))
+
+    def test_synthetic_rows_are_deterministic(self):
+        """Test that the same seed produces the same table contents"""
+        query = "SELECT title, created_at, embedding FROM telegram.articles ORDER BY id"
+        first = create_articles_db(rows=20, embedding_dim=4, seed=7).execute(query).fetchall()
+        second = create_articles_db(rows=20, embedding_dim=4, seed=7).execute(query).fetchall()
+
+        self.assertEqual(first, second)
+
+    def test_latency_model(self):
+        """Test fixed, recorded and lognormal injected latency"""
+        self.assertEqual(LatencyModel().sample_ms(), 0.0)
+        self.assertEqual(LatencyModel(25).sample_ms(), 25)
+        self.assertEqual(LatencyModel(distribution='recorded', scale=0.5).sample_ms(400), 200)
+        samples = [LatencyModel(100, 'lognormal', seed=1).sample_ms() for _ in range(3)]
+        self.assertEqual(len(set(samples)), 1)
+
+    def test_ocr_replay_result_has_sdk_shape(self):
+        """Test that replayed OCR results expose attributes like GeneralTextResult"""
+        result = ReplayOcrClient().recognize_general_text(None).result
+
+        self.assertEqual(result.words_block_list[0].words, "Hello, Huawei Cloud OCR!")
+        self.assertEqual(result.words_block_count, 1)
+
+    def test_record_deepseek_keeps_answers_after_a_failure(self):
+        """Test that a failed question is reported and the other answers are still saved"""
+        answer = {'choices': [{'message': {'content': 'SELECT 1'}}]}
+        responses = iter([ReplayResponse(200, answer), ReplayResponse(500, {'error': 'boom'}),
+                          ReplayResponse(200, answer)])
+
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(demo.requests.Session, 'post', lambda self, *args, **kwargs: next(responses)), \
+                patch('builtins.print'):
+            fixture_path = os.path.join(directory, 'fixture.json')
+            failed = record_deepseek(['first', 'second', 'third'], 'key', fixture_path)
+            with open(fixture_path) as f:
+                recorded = json.load(f)['responses']
+
+        self.assertEqual(failed, ['second'])
+        self.assertEqual([entry['question'] for entry in recorded], ['first', 'third'])
+
+
+if __name__ == '__main__':
+    unittest.main()
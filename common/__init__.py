@@ -0,0 +1 @@
+"""Helpers shared by the demos in this repository."""
@@ -0,0 +1,300 @@
+"""
+Process-wide registry of Huawei Cloud SDK clients
+
+The demos used to build a fresh client for every entry point, each with its
+own credentials lookup, region parsing and HTTP session. The registry builds
+one client per (service, region, project, access key, secret key) on first
+use and hands the same object to every later caller, from any thread.
+
+- Credentials and region come from arguments or the environment. Both naming
+  schemes used in this repository are accepted (HUAWEICLOUD_SDK_* and
+  HUAWEI_CLOUD_*), the service's own scheme first. The access key, secret
+  key, region and project id are always taken from the same scheme, so one
+  demo's region or project never leaks into another's credentials.
+- Region names are resolved once ('ap-southeast-1' and 'AP_SOUTHEAST_1' are
+  both accepted).
+- When no project id is given the SDK asks IAM for it while building the
+  client. The answer is remembered per (access key, region), so other
+  services in the same region skip that lookup.
+- All clients share one tuned HttpConfig and one SDK HttpClient, which means
+  one requests session and connection pool for every service.
+- warm_up() builds clients and opens their TLS connections ahead of the first
+  real request.
+
+The SDK has no public API for sharing an HttpClient or reaching its session,
+so the registry relies on internals of huaweicloudsdkcore: Client._http_client,
+Client._endpoints and HttpClient._session (a requests.Session). They are
+present in 3.1.158, the version pinned by both demos; check them again when
+upgrading the SDK.
+
+Example:
+    from common.huawei_clients import get_client, warm_up
+
+    warm_up(['ocr', 'image'])
+    client = get_client('ocr')
+"""
+
+import functools
+import hashlib
+import importlib
+import os
+import threading
+import time
+
+from common.tracing import record_retries, span
+
+# service -> (client module, client class, region module, region class, default region)
+SERVICES = {
+    'image': ('huaweicloudsdkimage.v2', 'ImageClient',
+              'huaweicloudsdkimage.v2.region.image_region', 'ImageRegion', 'cn-north-4'),
+    'ocr': ('huaweicloudsdkocr.v1', 'OcrClient',
+            'huaweicloudsdkocr.v1.region.ocr_region', 'OcrRegion', 'ap-southeast-1'),
+}
+
+# setting -> environment variables per naming scheme
+ENV_NAMES = {
+    'ak': {'sdk': 'HUAWEICLOUD_SDK_AK', 'cloud': 'HUAWEI_CLOUD_ACCESS_KEY'},
+    'sk': {'sdk': 'HUAWEICLOUD_SDK_SK', 'cloud': 'HUAWEI_CLOUD_SECRET_KEY'},
+    'region': {'sdk': 'HUAWEICLOUD_SDK_REGION', 'cloud': 'HUAWEI_CLOUD_REGION'},
+    'project_id': {'sdk': 'HUAWEICLOUD_SDK_PROJECT_ID', 'cloud': 'HUAWEI_CLOUD_PROJECT_ID'},
+}
+
+# Naming scheme each demo documents, checked first for that service
+SERVICE_ENV_SCHEME = {'image': ('cloud', 'sdk'), 'ocr': ('sdk', 'cloud')}
+
+
+def _service(service):
+    try:
+        return SERVICES[service]
+    except KeyError:
+        raise ValueError(f"Unknown service '{service}', expected one of: {', '.join(SERVICES)}") from None
+
+
+def env_credentials(service):
+    """
+    Return the credential settings for a service from the environment.
+
+    All settings come from the first naming scheme, in the service's order,
+    that sets an access key.
+
+    Returns:
+        dict: ak, sk, region and project_id, each None when not set
+    """
+    for scheme in SERVICE_ENV_SCHEME.get(service, ('sdk', 'cloud')):
+        if os.getenv(ENV_NAMES['ak'][scheme]):
+            return {name: os.getenv(names[scheme]) or None for name, names in ENV_NAMES.items()}
+    return dict.fromkeys(ENV_NAMES)
+
+
+@functools.lru_cache(maxsize=64)
+def resolve_region(service, name=None):
+    """
+    Resolve a region name to the service's SDK Region object.
+
+    Args:
+        service (str): 'image' or 'ocr'
+        name (str): Region id ('cn-north-4') or constant name ('CN_NORTH_4'),
+            the service default when empty
+
+    Returns:
+        Region: SDK region object
+
+    Raises:
+        ValueError: If the service is not available in that region
+    """
+    _, _, region_module, region_class, default = _service(service)
+    region_id = (name or default).strip().lower().replace('_', '-')
+    regions = getattr(importlib.import_module(region_module), region_class)
+    try:
+        return regions.value_of(region_id)
+    except KeyError as e:
+        raise ValueError(e.args[0] if e.args else f"Unsupported region '{name}'") from None
+
+
+def create_http_config(timeout=(5, 30), retry_times=2, pool_connections=16, pool_maxsize=32):
+    """
+    Return the HttpConfig shared by every client in a registry.
+
+    Args:
+        timeout (tuple): (connect, read) timeout in seconds
+        retry_times (int): Retries for connection errors and HTTP 429
+        pool_connections (int): Number of hosts kept in the connection pool
+        pool_maxsize (int): Connections kept per host
+    """
+    from huaweicloudsdkcore.http.http_config import HttpConfig
+
+    config = HttpConfig.get_default_config()
+    config.timeout = timeout
+    config.retry_times = retry_times
+    config.pool_connections = pool_connections
+    config.pool_maxsize = pool_maxsize
+    return config
+
+
+class ClientRegistry:
+    """Lazily builds Huawei Cloud clients and shares them between callers and threads."""
+
+    def __init__(self, http_config=None):
+        self._http_config = http_config
+        self._http_client = None
+        self._clients = {}
+        self._project_ids = {}
+        self._build_locks = {}
+        self._lock = threading.Lock()
+
+    @property
+    def http_config(self):
+        if self._http_config is None:
+            self._http_config = create_http_config()
+        return self._http_config
+
+    def get(self, service, region=None, project_id=None, ak=None, sk=None):
+        """
+        Return the shared client for a service, building it on first use.
+
+        Arguments left as None are read from the environment (see env_credentials()).
+
+        Args:
+            service (str): 'image' or 'ocr'
+            region (str): Region id or constant name
+            project_id (str): Project id, looked up through IAM when not set
+            ak (str): Access Key
+            sk (str): Secret Key
+
+        Returns:
+            Client: ImageClient or OcrClient
+
+        Raises:
+            ValueError: On an unknown service, unsupported region or missing credentials
+        """
+        _service(service)
+        env = env_credentials(service)
+        if ak and ak != env['ak']:
+            # Region and project in the environment belong to another account
+            env = dict.fromkeys(env)
+        ak = ak or env['ak']
+        sk = sk or env['sk']
+        if not ak or not sk:
+            raise ValueError(f"Missing credentials for '{service}': set {ENV_NAMES['ak']['sdk']} and "
+                             f"{ENV_NAMES['sk']['sdk']} (or {ENV_NAMES['ak']['cloud']} and "
+                             f"{ENV_NAMES['sk']['cloud']})")
+        region_obj = resolve_region(service, region or env['region'])
+        project_id = project_id or env['project_id']
+
+        # A rotated secret key must not get the client built with the old one;
+        # only its digest is kept in the key
+        key = (service, region_obj.id, project_id, ak, hashlib.sha256(sk.encode()).hexdigest())
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        # One lock per key: concurrent callers of the same client wait for a
+        # single build, while different clients build in parallel
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._build(service, region_obj, project_id, ak, sk)
+                self._clients[key] = client
+        return client
+
+    def _build(self, service, region_obj, project_id, ak, sk):
+        from huaweicloudsdkcore.auth.credentials import BasicCredentials
+
+        client_module, client_class, _, _, _ = SERVICES[service]
+        client_type = getattr(importlib.import_module(client_module), client_class)
+
+        project_id = project_id or self._project_ids.get((ak, region_obj.id))
+        credentials = BasicCredentials(ak, sk, project_id) if project_id else BasicCredentials(ak, sk)
+
+        with span('huawei_client.build') as s:
+            s.set('service', service)
+            s.set('region', region_obj.id)
+            client = client_type.new_builder() \
+                .with_credentials(credentials) \
+                .with_http_config(self.http_config) \
+                .with_region(region_obj) \
+                .build()
+
+        # build() filled in the project id from IAM if it was missing
+        if credentials.project_id:
+            self._project_ids[(ak, region_obj.id)] = credentials.project_id
+        self._share_http_client(client)
+        return client
+
+    def _share_http_client(self, client):
+        """Point the client at the registry's HttpClient so all services use one pool."""
+        with self._lock:
+            own = client.get_http_client()
+            if self._http_client is None:
+                self._http_client = own
+                # The SDK retries inside urllib3 and sends on the calling
+                # thread, so the hook credits them to the caller's span
+                session = getattr(own, '_session', None)
+                if session is not None:
+                    session.hooks['response'].append(record_retries)
+            elif own is not self._http_client:
+                # The SDK has no builder option for an existing HttpClient
+                client._http_client = self._http_client
+                own.close()
+
+    def warm_up(self, services=None, region=None, connect=True):
+        """
+        Build clients ahead of time, optionally opening a connection to each endpoint.
+
+        Args:
+            services (list): Services to prepare (default: all)
+            region (str): Region for every service (default: environment or service default)
+            connect (bool): Also send a HEAD request to each endpoint so the TLS
+                handshake is done and the connection sits in the shared pool
+
+        Returns:
+            dict: service -> seconds spent, or the error message if it failed
+        """
+        services = list(services or SERVICES)
+        timings = {}
+
+        def prepare(service):
+            start = time.perf_counter()
+            try:
+                client = self.get(service, region=region)
+                if connect:
+                    self._connect(client)
+                timings[service] = time.perf_counter() - start
+            except Exception as e:
+                timings[service] = str(e)
+
+        threads = [threading.Thread(target=prepare, args=(service,), daemon=True) for service in services]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {service: timings[service] for service in services}
+
+    def _connect(self, client):
+        session = getattr(client.get_http_client(), '_session', None)
+        if session is None:
+            return
+        timeout = self.http_config.timeout
+        for endpoint in client._endpoints:
+            with span('huawei_client.connect') as s:
+                s.set('endpoint', endpoint)
+                try:
+                    session.head(endpoint, timeout=timeout).close()
+                except Exception as e:
+                    s.set('error', str(e))
+
+    def close(self):
+        """Close the shared connection pool and forget every client."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._clients.clear()
+            self._build_locks.clear()
+
+
+registry = ClientRegistry()
+get_client = registry.get
+warm_up = registry.warm_up
@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.huawei_clients import ClientRegistry, env_credentials, resolve_region
+
+# With a project id the SDK builds clients without calling IAM, so no network is needed
+ENV = {'HUAWEICLOUD_SDK_AK': 'ak', 'HUAWEICLOUD_SDK_SK': 'sk', 'HUAWEICLOUD_SDK_PROJECT_ID': 'project'}
+
+
+class TestHuaweiClients(unittest.TestCase):
+
+    def test_one_client_per_key_across_threads(self):
+        """Test that concurrent callers share a single built client"""
+        registry = ClientRegistry()
+        clients = []
+        with patch.dict(os.environ, ENV, clear=True):
+            threads = [threading.Thread(target=lambda: clients.append(registry.get('ocr'))) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            other_region = registry.get('ocr', region='cn-north-4')
+
+        self.assertEqual(len(set(map(id, clients))), 1)
+        self.assertIsNot(other_region, clients[0])
+        registry.close()
+
+    def test_secret_key_is_part_of_the_client_key(self):
+        """Test that a different secret key for the same access key builds a new client"""
+        registry = ClientRegistry()
+        with patch.dict(os.environ, ENV, clear=True):
+            first = registry.get('ocr')
+            same = registry.get('ocr', ak='ak', sk='sk')
+            rotated = registry.get('ocr', ak='ak', sk='new-sk', project_id='project')
+
+        self.assertIs(same, first)
+        self.assertIsNot(rotated, first)
+        self.assertEqual(rotated.get_credentials().sk, 'new-sk')
+        registry.close()
+
+    def test_services_share_one_http_client(self):
+        """Test that image and OCR clients use the same connection pool"""
+        registry = ClientRegistry()
+        with patch.dict(os.environ, ENV, clear=True):
+            ocr = registry.get('ocr', region='AP_SOUTHEAST_1')
+            image = registry.get('image', region='ap-southeast-1')
+
+        self.assertIs(ocr.get_http_client(), image.get_http_client())
+        self.assertEqual(ocr.get_http_client().config.pool_maxsize, 32)
+        registry.close()
+
+    def test_settings_resolution(self):
+        """Test region spellings, both env var schemes and missing credentials"""
+        self.assertIs(resolve_region('ocr', 'AP_SOUTHEAST_1'), resolve_region('ocr', 'ap-southeast-1'))
+        self.assertEqual(resolve_region('image').id, 'cn-north-4')
+        with self.assertRaises(ValueError):
+            resolve_region('image', 'xx-nowhere-1')
+
+        with patch.dict(os.environ, {'HUAWEI_CLOUD_ACCESS_KEY': 'cloud', 'HUAWEICLOUD_SDK_AK': 'sdk'}, clear=True):
+            self.assertEqual(env_credentials('image')['ak'], 'cloud')
+            self.assertEqual(env_credentials('ocr')['ak'], 'sdk')
+        with patch.dict(os.environ, {}, clear=True), self.assertRaises(ValueError):
+            ClientRegistry().get('ocr')
+
+    def test_settings_never_mix_naming_schemes(self):
+        """Test that OCR ignores the image demo's region and project when its own AK is set"""
+        env = {'HUAWEICLOUD_SDK_AK': 'ak', 'HUAWEICLOUD_SDK_SK': 'sk',
+               'HUAWEI_CLOUD_ACCESS_KEY': 'other', 'HUAWEI_CLOUD_SECRET_KEY': 'other-sk',
+               'HUAWEI_CLOUD_REGION': 'cn-north-4', 'HUAWEI_CLOUD_PROJECT_ID': 'image-project'}
+        with patch.dict(os.environ, env, clear=True):
+            credentials = env_credentials('ocr')
+            self.assertEqual(credentials, {'ak': 'ak', 'sk': 'sk', 'region': None, 'project_id': None})
+            self.assertEqual(env_credentials('image')['project_id'], 'image-project')
+
+        with patch.dict(os.environ, dict(env, HUAWEICLOUD_SDK_PROJECT_ID='project'), clear=True):
+            registry = ClientRegistry()
+            client = registry.get('ocr')
+            self.assertIn('ap-southeast-1', client._endpoints[0])
+            self.assertEqual(client.get_credentials().project_id, 'project')
+            registry.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import tempfile
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import sys
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common import tracing
+from common.tracing import NOOP_SPAN, Tracer, record_retries
+
+
+class TestTracing(unittest.TestCase):
+
+    def test_disabled_tracer_records_nothing(self):
+        """Test that a disabled tracer returns the no-op span and records no spans"""
+        tracer = Tracer(enabled=False)
+
+        @tracer.traced('work')
+        def work():
+            return 42
+
+        self.assertEqual(work(), 42)
+        self.assertIs(tracer.span('anything'), NOOP_SPAN)
+        self.assertEqual(tracer.spans, [])
+
+    def test_nested_spans_record_parent_bytes_and_errors(self):
+        """Test that nested spans are linked and carry bytes, retries and errors"""
+        tracer = Tracer(enabled=True)
+
+        with tracer.span('outer') as outer:
+            with tracer.span('inner', step='read') as inner:
+                inner.add_bytes(10)
+                inner.add_retry()
+        with self.assertRaises(ValueError):
+            with tracer.span('failing'):
+                raise ValueError("boom")
+
+        spans = {span.name: span.to_dict() for span in tracer.spans}
+        self.assertEqual(spans['inner']['parent_id'], outer.span_id)
+        self.assertEqual(spans['inner']['bytes'], 10)
+        self.assertEqual(spans['inner']['retries'], 1)
+        self.assertEqual(spans['inner']['attributes'], {'step': 'read'})
+        self.assertEqual(spans['failing']['error'], 'ValueError')
+        self.assertGreaterEqual(spans['outer']['duration_ms'], spans['inner']['duration_ms'])
+
+    def test_exports(self):
+        """Test JSON lines export and Prometheus histogram output"""
+        tracer = Tracer(enabled=True, buckets=(0.5, 1.0))
+
+        @tracer.traced()
+        def generate_sql():
+            tracer.current_span().add_bytes(5)
+
+        generate_sql()
+        generate_sql()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.jsonl')
+            tracer.export_jsonl(path)
+            with open(path) as f:
+                rows = [json.loads(line) for line in f]
+        self.assertEqual([row['name'] for row in rows], ['generate_sql', 'generate_sql'])
+
+        text = tracer.prometheus_text()
+        self.assertIn('demo_span_duration_seconds_bucket{span="generate_sql",le="0.5"} 2', text)
+        self.assertIn('demo_span_duration_seconds_count{span="generate_sql"} 2', text)
+        self.assertIn('demo_span_bytes_total{span="generate_sql"} 10', text)
+
+    def test_response_hook_records_urllib3_retries(self):
+        """Test that retries made inside the HTTPAdapter are added to the current span"""
+        attempts = []
+
+        class FlakyHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                attempts.append(self.path)
+                self.send_response(503 if len(attempts) < 3 else 200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        tracer = Tracer(enabled=True)
+        try:
+            with requests.Session() as session, patch.object(tracing, 'tracer', tracer):
+                retry = Retry(total=3, status_forcelist=[503], backoff_factor=0)
+                session.mount('http://', HTTPAdapter(max_retries=retry))
+                session.hooks['response'].append(record_retries)
+                with tracer.span('request'):
+                    response = session.get(f"http://127.0.0.1:{server.server_port}/")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(tracer.spans[0].retries, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,293 @@
+"""
+Lightweight tracing shared by the demos
+
+Spans record a monotonic duration plus optional byte counts, retry counts and
+attributes for one step of a demo (an API call, a file read, a query...).
+Finished spans can be exported as JSON lines and aggregated into
+Prometheus-style histograms.
+
+Tracing is off by default. When disabled, span() hands back a shared no-op
+object and traced() functions call straight through, so the instrumentation
+costs a flag check per call.
+
+Configuration (environment variables):
+- DEMO_TRACE=1              enable tracing
+- DEMO_TRACE_FILE=path      append every finished span to this JSON lines file
+- DEMO_TRACE_METRICS=path   write Prometheus text metrics to this file at exit
+
+Example:
+    from common.tracing import span, traced
+
+    @traced('generate_sql')
+    def generate_sql(query):
+        with span('generate_sql.request') as s:
+            response = requests.post(...)
+            s.add_bytes(len(response.content))
+"""
+
+import atexit
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Span:
+    """A single timed operation. Use through Tracer.span() as a context manager."""
+
+    __slots__ = ('tracer', 'name', 'span_id', 'parent_id', 'attributes', 'bytes',
+                 'retries', 'error', 'thread', 'start_time', '_start', 'duration')
+
+    def __init__(self, tracer, name, span_id, parent_id, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.bytes = 0
+        self.retries = 0
+        self.error = None
+        self.thread = None
+        self.start_time = None
+        self._start = None
+        self.duration = None
+
+    def set(self, key, value):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def add_bytes(self, count):
+        """Add to the number of bytes read, sent or received in this span."""
+        self.bytes += count
+
+    def add_retry(self, count=1):
+        """Record that the operation was retried."""
+        self.retries += count
+
+    def __enter__(self):
+        self.tracer._push(self)
+        self.thread = threading.current_thread().name
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self.tracer._pop(self)
+        return False
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self.start_time,
+            'duration_ms': round(self.duration * 1000, 3) if self.duration is not None else None,
+            'bytes': self.bytes,
+            'retries': self.retries,
+            'error': self.error,
+            'thread': self.thread,
+            'attributes': self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def add_bytes(self, count):
+        pass
+
+    def add_retry(self, count=1):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _Histogram:
+    """Cumulative duration histogram plus byte and retry totals for one span name."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.bytes = 0
+        self.retries = 0
+        self.errors = 0
+
+    def observe(self, span):
+        for i, bound in enumerate(self.buckets):
+            if span.duration <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += span.duration
+        self.bytes += span.bytes
+        self.retries += span.retries
+        if span.error:
+            self.errors += 1
+
+
+class Tracer:
+    """
+    Collects spans, aggregates them per name and exports them.
+
+    Args:
+        enabled (bool): Record spans; when False every call is a no-op
+        trace_file (str): Optional JSON lines file that receives each finished span
+        buckets (tuple): Histogram bucket upper bounds in seconds
+        max_spans (int): Finished spans kept in memory for inspection
+    """
+
+    def __init__(self, enabled=False, trace_file=None, buckets=DEFAULT_BUCKETS, max_spans=10000):
+        self.enabled = enabled
+        self.trace_file = trace_file
+        self.buckets = tuple(buckets)
+        self.max_spans = max_spans
+        self.spans = []
+        self.histograms = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls):
+        """Build a tracer configured from the DEMO_TRACE* environment variables."""
+        enabled = os.getenv('DEMO_TRACE', '').lower() in ('1', 'true', 'yes', 'on')
+        tracer = cls(enabled=enabled, trace_file=os.getenv('DEMO_TRACE_FILE') or None)
+        metrics_file = os.getenv('DEMO_TRACE_METRICS')
+        if enabled and metrics_file:
+            atexit.register(tracer.write_prometheus, metrics_file)
+        return tracer
+
+    def span(self, name, **attributes):
+        """Return a context manager timing the enclosed block."""
+        if not self.enabled:
+            return NOOP_SPAN
+        stack = getattr(self._local, 'stack', None)
+        parent_id = stack[-1].span_id if stack else None
+        return Span(self, name, next(self._ids), parent_id, attributes)
+
+    def traced(self, name=None):
+        """Decorator timing every call of a function as a span."""
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def current_span(self):
+        """Return the innermost open span on this thread, or the no-op span."""
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else NOOP_SPAN
+
+    def _push(self, span):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(span)
+
+    def _pop(self, span):
+        stack = self._local.stack
+        if stack and stack[-1] is span:
+            stack.pop()
+        with self._lock:
+            histogram = self.histograms.get(span.name)
+            if histogram is None:
+                histogram = self.histograms[span.name] = _Histogram(self.buckets)
+            histogram.observe(span)
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+            if self.trace_file:
+                with open(self.trace_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+    def reset(self):
+        """Drop all recorded spans and histograms."""
+        with self._lock:
+            self.spans = []
+            self.histograms = {}
+
+    def export_jsonl(self, path):
+        """Write the recorded spans to a JSON lines file."""
+        with self._lock:
+            spans = list(self.spans)
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+    def prometheus_text(self, prefix='demo_span'):
+        """Render the per-span histograms in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+        lines = [
+            f"# HELP {prefix}_duration_seconds Duration of traced demo operations.",
+            f"# TYPE {prefix}_duration_seconds histogram",
+        ]
+        for name, histogram in histograms:
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{prefix}_duration_seconds_bucket{{span="{name}",le="{bound:g}"}} {count}')
+            lines.append(f'{prefix}_duration_seconds_bucket{{span="{name}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{prefix}_duration_seconds_sum{{span="{name}"}} {histogram.sum:.6f}')
+            lines.append(f'{prefix}_duration_seconds_count{{span="{name}"}} {histogram.count}')
+        for metric, attribute, help_text in (
+                ('bytes_total', 'bytes', "Bytes processed by traced demo operations."),
+                ('retries_total', 'retries', "Retries performed by traced demo operations."),
+                ('errors_total', 'errors', "Traced demo operations that raised an exception.")):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, histogram in histograms:
+                lines.append(f'{prefix}_{metric}{{span="{name}"}} {getattr(histogram, attribute)}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write prometheus_text() to a file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+
+
+tracer = Tracer.from_env()
+span = tracer.span
+traced = tracer.traced
+
+
+def response_retries(response):
+    """Return how many times urllib3 retried the request behind a requests response (0 if unknown)."""
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    return len(getattr(retries, 'history', None) or ())
+
+
+def record_retries(response, *args, **kwargs):
+    """
+    requests response hook that adds the request's retries to the current span.
+
+    Install with session.hooks['response'].append(record_retries). Retries
+    made by the session's HTTPAdapter happen inside urllib3, so this is the
+    only place they become visible.
+    """
+    count = response_retries(response)
+    if count:
+        tracer.current_span().add_retry(count)
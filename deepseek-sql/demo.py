@@ -5,6 +5,10 @@ import requests
 import mysql.connector
 from dotenv import load_dotenv
 
+# Make the helpers shared by all demos (../common) importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.tracing import response_retries, span, traced
+
 # Load environment variables from .env file
 load_dotenv(dotenv_path='.env')
 
@@ -41,6 +45,7 @@ def connect_to_db():
         sys.exit(1)
 
 # Generate SQL using DeepSeek API
+@traced('generate_sql')
 def generate_sql(natural_language_query):
     url = "https://api.deepseek.com/chat/completions"
     
@@ -81,7 +86,11 @@ def generate_sql(natural_language_query):
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data)
+        with span('generate_sql.request') as request_span:
+            response = requests.post(url, headers=headers, json=data)
+            request_span.set('status_code', response.status_code)
+            request_span.add_bytes(len(response.content))
+            request_span.add_retry(response_retries(response))
         response.raise_for_status()
         result = response.json()
         sql_query = result['choices'][0]['message']['content'].strip()
@@ -102,15 +111,20 @@ def generate_sql(natural_language_query):
         sys.exit(1)
 
 # Execute SQL query and return results
+@traced('execute_query')
 def execute_query(connection, sql_query):
+    cursor = None
     try:
         cursor = connection.cursor()
-        cursor.execute(sql_query)
+        with span('execute_query.execute'):
+            cursor.execute(sql_query)
         
         # If it's a SELECT query, fetch results (limit to 5)
         if sql_query.strip().upper().startswith("SELECT"):
             columns = [desc[0] for desc in cursor.description]
-            results = cursor.fetchall()
+            with span('execute_query.fetch') as fetch_span:
+                results = cursor.fetchall()
+                fetch_span.set('rows', len(results))
             
             # Limit to last 5 results
             if len(results) > 5:
@@ -128,6 +142,7 @@ def execute_query(connection, sql_query):
             cursor.close()
 
 # Format and display results
+@traced('display_results')
 def display_results(columns, results):
     if columns is None:
         print(results)
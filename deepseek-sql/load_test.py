@@ -0,0 +1,314 @@
+"""
+Multi-user load test for the NL -> SQL pipeline
+
+demo.py serves one user through an input() loop. This script simulates N
+concurrent sessions, each running the same generate_sql -> execute_query ->
+display_results flow in a closed loop (send a question, wait for the answer,
+optionally think, repeat), and measures how the pipeline scales.
+
+The DeepSeek API is replaced by recorded responses (benchmarks/replay.py)
+with a configurable latency distribution, and MySQL by a SQLite copy of
+telegram.articles (benchmarks/sqlite_articles.py) with one connection per
+session. `--llm-slots` caps the number of LLM requests in flight, like a
+provider's concurrency limit.
+
+For each concurrency level the report gives throughput, end-to-end latency
+percentiles and the mean time per stage. The summary gives the saturation
+point: the last level after which adding sessions stops raising throughput
+by at least `--min-gain` of the ideal linear increase.
+
+Usage:
+    python load_test.py [--concurrency 1,2,4,8,16,32] [--duration 10] [--warmup 2]
+        [--latency-ms 800] [--distribution lognormal] [--llm-slots 8]
+        [--think-ms 0] [--mix mix.json] [--slo-ms 2000] [--json report.json]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import demo
+from benchmarks.replay import LatencyModel, ReplayHTTP
+from benchmarks.run_benchmarks import percentile
+from benchmarks.sqlite_articles import create_articles_db
+
+STAGES = ('generate_sql', 'execute_query', 'display_results')
+
+
+class LimitedLLM:
+    """Forwards to ReplayHTTP.post with at most `slots` requests in flight (no limit when None)."""
+
+    def __init__(self, replay, slots=None):
+        self.replay = replay
+        self._slots = threading.BoundedSemaphore(slots) if slots else None
+
+    def post(self, *args, **kwargs):
+        if self._slots is None:
+            return self.replay.post(*args, **kwargs)
+        with self._slots:
+            return self.replay.post(*args, **kwargs)
+
+
+def run_session(session_id, db_path, questions, weights, seed, barrier, window, think_s):
+    """
+    Run one simulated user until the end of the measurement window.
+
+    Args:
+        session_id (int): Session number, also seeds the question choice
+        db_path (str): SQLite file holding telegram.articles
+        questions (list): Questions to choose from
+        weights (list): Relative frequency of each question
+        seed (int): Seed for the question mix
+        barrier (threading.Barrier): Releases all sessions at the same time
+        window (list): [measure_from, deadline] as perf_counter times, set by the caller
+        think_s (float): Pause between requests in seconds
+
+    Returns:
+        tuple: (records, errors) where each record is
+            (total, generate_sql, execute_query, display_results) in seconds
+    """
+    rng = random.Random(f"{seed}-{session_id}")
+    connection = create_articles_db(db_path, rows=0)
+    records = []
+    errors = 0
+    try:
+        barrier.wait()
+        measure_from, deadline = window
+        while True:
+            start = time.perf_counter()
+            if start >= deadline:
+                break
+            question = rng.choices(questions, weights)[0]
+            try:
+                sql = demo.generate_sql(question)
+                generated = time.perf_counter()
+                columns, results = demo.execute_query(connection, sql)
+                executed = time.perf_counter()
+                demo.display_results(columns, results)
+                displayed = time.perf_counter()
+            except (Exception, SystemExit):
+                # generate_sql() exits on API errors; count it instead of killing the session
+                if measure_from <= time.perf_counter() <= deadline:
+                    errors += 1
+                continue
+            # Count requests that complete inside the window, so throughput is
+            # not biased by requests still in flight at either edge
+            if measure_from <= displayed <= deadline:
+                records.append((displayed - start, generated - start, executed - generated, displayed - executed))
+            if think_s:
+                time.sleep(think_s)
+    finally:
+        connection.close()
+    return records, errors
+
+
+def run_level(concurrency, db_path, questions, weights, duration, warmup=0.0, think_s=0.0, seed=0):
+    """
+    Run `concurrency` sessions for warmup + duration seconds and summarize the measured part.
+
+    Returns:
+        dict: Report row for this concurrency level
+
+    Raises:
+        RuntimeError: If a session failed outside a request (for example while
+            opening the database), with that session's exception as the cause
+    """
+    results = [None] * concurrency
+    failures = {}
+    barrier = threading.Barrier(concurrency + 1)
+    window = [0.0, 0.0]
+
+    def target(session_id):
+        try:
+            results[session_id] = run_session(session_id, db_path, questions, weights, seed,
+                                               barrier, window, think_s)
+        except (Exception, SystemExit) as e:
+            failures[session_id] = e
+            # Release everyone still waiting, or they would wait for this session forever
+            barrier.abort()
+
+    threads = [threading.Thread(target=target, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    # Sessions read the window after the barrier, so it can be set just before releasing them
+    now = time.perf_counter()
+    window[0] = now + warmup
+    window[1] = now + warmup + duration
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass  # a session failed before the start; reported below
+    for thread in threads:
+        thread.join()
+
+    if failures:
+        # Sessions released by barrier.abort() only report BrokenBarrierError
+        cause = next((e for e in failures.values() if not isinstance(e, threading.BrokenBarrierError)),
+                     next(iter(failures.values())))
+        raise RuntimeError(f"{len(failures)} of {concurrency} sessions failed: {cause!r}") from cause
+
+    records = [record for session_records, _ in results for record in session_records]
+    errors = sum(session_errors for _, session_errors in results)
+    totals = [record[0] for record in records]
+    row = {
+        'concurrency': concurrency,
+        'requests': len(records),
+        'errors': errors,
+        'throughput_rps': len(records) / duration,
+        'latency_p50_ms': percentile(totals, 50) * 1000,
+        'latency_p90_ms': percentile(totals, 90) * 1000,
+        'latency_p95_ms': percentile(totals, 95) * 1000,
+        'latency_p99_ms': percentile(totals, 99) * 1000,
+        'latency_max_ms': max(totals, default=0.0) * 1000,
+    }
+    for index, stage in enumerate(STAGES, start=1):
+        row[f'{stage}_mean_ms'] = sum(record[index] for record in records) / len(records) * 1000 if records else 0.0
+    return row
+
+
+def find_saturation(rows, min_gain=0.5, slo_ms=None):
+    """
+    Summarize a throughput-vs-concurrency curve.
+
+    Moving from one level to the next, the gain is the throughput increase
+    divided by the increase perfect linear scaling would give. The pipeline
+    is saturated at the last level before the gain drops below `min_gain`.
+
+    Args:
+        rows (list): Report rows from run_level(), in increasing concurrency
+        min_gain (float): Smallest acceptable fraction of linear scaling
+        slo_ms (float): Optional p95 latency objective
+
+    Returns:
+        dict: peak throughput, saturation concurrency and, with slo_ms, the
+            highest concurrency whose p95 latency meets it
+    """
+    peak = max(rows, key=lambda row: row['throughput_rps'])
+    saturation = None
+    for previous, row in zip(rows, rows[1:]):
+        ideal = previous['throughput_rps'] * row['concurrency'] / previous['concurrency']
+        if ideal <= previous['throughput_rps']:
+            continue
+        gain = (row['throughput_rps'] - previous['throughput_rps']) / (ideal - previous['throughput_rps'])
+        if gain < min_gain:
+            saturation = previous['concurrency']
+            break
+    summary = {
+        'peak_throughput_rps': peak['throughput_rps'],
+        'peak_concurrency': peak['concurrency'],
+        'saturation_concurrency': saturation,
+    }
+    if slo_ms is not None:
+        within = [row['concurrency'] for row in rows if row['requests'] and row['latency_p95_ms'] <= slo_ms]
+        summary['max_concurrency_within_slo'] = max(within, default=None)
+    return summary
+
+
+def load_mix(path, questions):
+    """Return (questions, weights) from a {question: weight} JSON file, or a uniform mix."""
+    if not path:
+        return questions, [1.0] * len(questions)
+    with open(path, 'r', encoding='utf-8') as f:
+        mix = json.load(f)
+    unknown = [question for question in mix if question not in questions]
+    if unknown:
+        raise ValueError(f"No recorded response for: {', '.join(map(repr, unknown))}")
+    return list(mix), [float(weight) for weight in mix.values()]
+
+
+def print_report(rows, summary):
+    print(f"{'sessions':>8} {'req/s':>9} {'requests':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'llm ms':>9} {'query ms':>9} {'display ms':>10}")
+    print("-" * 97)
+    for row in rows:
+        print(f"{row['concurrency']:>8} {row['throughput_rps']:>9.1f} {row['requests']:>9} {row['errors']:>7} "
+              f"{row['latency_p50_ms']:>9.1f} {row['latency_p95_ms']:>9.1f} {row['latency_p99_ms']:>9.1f} "
+              f"{row['generate_sql_mean_ms']:>9.1f} {row['execute_query_mean_ms']:>9.2f} "
+              f"{row['display_results_mean_ms']:>10.3f}")
+
+    print("\nThroughput vs. concurrency:")
+    peak = summary['peak_throughput_rps'] or 1.0
+    for row in rows:
+        bar = '#' * int(round(row['throughput_rps'] / peak * 50))
+        print(f"{row['concurrency']:>8} | {bar} {row['throughput_rps']:.1f}")
+
+    print(f"\nPeak throughput: {summary['peak_throughput_rps']:.1f} req/s at {summary['peak_concurrency']} sessions")
+    if summary['saturation_concurrency'] is None:
+        print("Saturation: not reached at the tested concurrency levels")
+    else:
+        print(f"Saturation: throughput stops scaling beyond {summary['saturation_concurrency']} sessions")
+    if 'max_concurrency_within_slo' in summary:
+        print(f"Highest concurrency meeting the p95 objective: {summary['max_concurrency_within_slo']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-user load test for the NL -> SQL pipeline.")
+    parser.add_argument('--concurrency', default='1,2,4,8,16,32',
+                        help="Comma-separated session counts (default: 1,2,4,8,16,32)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Measured seconds per level (default: 10)")
+    parser.add_argument('--warmup', type=float, default=2.0, help="Unmeasured seconds per level (default: 2)")
+    parser.add_argument('--latency-ms', type=float, default=800.0, help="Mean LLM latency (default: 800)")
+    parser.add_argument('--distribution', default='lognormal', choices=('fixed', 'lognormal', 'recorded'),
+                        help="LLM latency distribution (default: lognormal)")
+    parser.add_argument('--sigma', type=float, default=0.5, help="Lognormal shape (default: 0.5)")
+    parser.add_argument('--llm-slots', type=int, help="Maximum LLM requests in flight (default: unlimited)")
+    parser.add_argument('--think-ms', type=float, default=0.0, help="Pause between a session's requests")
+    parser.add_argument('--mix', help="JSON file mapping recorded questions to relative weights")
+    parser.add_argument('--rows', type=int, default=5000, help="Synthetic articles in SQLite (default: 5000)")
+    parser.add_argument('--embedding-dim', type=int, default=384, help="Embedding length (default: 384)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for data, latency and question mix")
+    parser.add_argument('--min-gain', type=float, default=0.5,
+                        help="Fraction of linear scaling below which a level counts as saturated (default: 0.5)")
+    parser.add_argument('--slo-ms', type=float, help="p95 latency objective to report against")
+    parser.add_argument('--json', help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    levels = sorted({int(level) for level in args.concurrency.split(',') if level.strip()})
+    if not levels or levels[0] < 1:
+        parser.error("--concurrency needs positive session counts")
+
+    latency = LatencyModel(args.latency_ms, args.distribution, sigma=args.sigma, seed=args.seed)
+    replay = ReplayHTTP(latency=latency)
+    try:
+        questions, weights = load_mix(args.mix, replay.questions)
+    except ValueError as e:
+        parser.error(str(e))
+    llm = LimitedLLM(replay, args.llm_slots)
+
+    db_dir = tempfile.mkdtemp(prefix="load_test_")
+    db_path = os.path.join(db_dir, 'telegram.db')
+    create_articles_db(db_path, rows=args.rows, embedding_dim=args.embedding_dim, seed=args.seed).close()
+
+    rows = []
+    try:
+        with patch.object(demo.requests, 'post', llm.post):
+            for concurrency in levels:
+                print(f"Running {concurrency} sessions...", file=sys.stderr)
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    rows.append(run_level(concurrency, db_path, questions, weights, args.duration,
+                                          warmup=args.warmup, think_s=args.think_ms / 1000, seed=args.seed))
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+    summary = find_saturation(rows, args.min_gain, args.slo_ms)
+    slots = args.llm_slots or 'unlimited'
+    print(f"Load test: {args.duration:g}s per level, {args.latency_ms:g} ms {args.distribution} LLM latency, "
+          f"{slots} LLM slots, {args.think_ms:g} ms think time, {args.rows} articles")
+    print_report(rows, summary)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'levels': rows, 'summary': summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
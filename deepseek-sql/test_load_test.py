@@ -0,0 +1,66 @@
+import unittest
+import tempfile
+import contextlib
+from unittest.mock import patch
+import sys
+import os
+
+# Add the demo.py file to the path so we can import functions from it
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import demo
+import load_test
+from benchmarks.replay import LatencyModel, ReplayHTTP
+from benchmarks.sqlite_articles import create_articles_db
+
+
+class TestLoadTest(unittest.TestCase):
+
+    def test_sessions_overlap_llm_latency(self):
+        """Test that concurrent sessions raise throughput while the LLM latency dominates"""
+        replay = ReplayHTTP(latency=LatencyModel(20))
+        with tempfile.TemporaryDirectory() as db_dir:
+            db_path = os.path.join(db_dir, 'telegram.db')
+            create_articles_db(db_path, rows=200, embedding_dim=8).close()
+            weights = [1.0] * len(replay.questions)
+
+            rows = []
+            with patch.object(demo.requests, 'post', replay.post), \
+                    open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for concurrency in (1, 4):
+                    rows.append(load_test.run_level(concurrency, db_path, replay.questions, weights,
+                                                    duration=0.5, warmup=0.1))
+
+        self.assertEqual([row['errors'] for row in rows], [0, 0])
+        self.assertGreater(rows[0]['requests'], 0)
+        self.assertGreater(rows[1]['throughput_rps'], rows[0]['throughput_rps'] * 2)
+        self.assertGreaterEqual(rows[0]['generate_sql_mean_ms'], 20)
+
+    def test_session_setup_failure_does_not_hang(self):
+        """Test that a session failing before the start aborts the level instead of blocking it"""
+        with tempfile.TemporaryDirectory() as db_dir:
+            db_path = os.path.join(db_dir, 'missing', 'telegram.db')
+            with self.assertRaises(RuntimeError) as raised:
+                load_test.run_level(4, db_path, ['question'], [1.0], duration=0.1)
+
+        self.assertIn('4 of 4 sessions failed', str(raised.exception))
+        self.assertNotIsInstance(raised.exception.__cause__, load_test.threading.BrokenBarrierError)
+
+    def test_find_saturation(self):
+        """Test the knee of the throughput curve and the latency objective"""
+        rows = [
+            {'concurrency': 1, 'throughput_rps': 10.0, 'latency_p95_ms': 100.0, 'requests': 10},
+            {'concurrency': 2, 'throughput_rps': 19.0, 'latency_p95_ms': 110.0, 'requests': 19},
+            {'concurrency': 4, 'throughput_rps': 25.0, 'latency_p95_ms': 200.0, 'requests': 25},
+            {'concurrency': 8, 'throughput_rps': 24.0, 'latency_p95_ms': 400.0, 'requests': 24},
+        ]
+
+        summary = load_test.find_saturation(rows, min_gain=0.5, slo_ms=250)
+
+        self.assertEqual(summary['saturation_concurrency'], 2)
+        self.assertEqual(summary['peak_concurrency'], 4)
+        self.assertEqual(summary['max_concurrency_within_slo'], 4)
+        self.assertIsNone(load_test.find_saturation(rows[:2])['saturation_concurrency'])
+
+
+if __name__ == '__main__':
+    unittest.main()
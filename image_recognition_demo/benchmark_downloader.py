@@ -0,0 +1,133 @@
+"""
+Benchmark for the concurrent image downloader
+
+Starts a local HTTP server that serves a directory of synthetic image files
+(with ETag and Last-Modified support) and compares:
+- sequential download_image() calls, one fresh connection per image
+- download_all() with an empty cache (cold)
+- download_all() with a populated cache (warm, served by 304 responses)
+
+The server can delay every response to approximate network round-trip time,
+which is where pooling and concurrency pay off.
+
+Usage:
+    python benchmark_downloader.py [num_images] [image_size_kb] [workers] [latency_ms]
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from image_downloader import download_all
+from image_recognition_demo import download_image
+
+
+class BenchmarkServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class CachingRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler that also answers If-None-Match with 304"""
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def send_head(self):
+        if self.latency:
+            time.sleep(self.latency)
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            etag = '"%s"' % hashlib.md5(f"{stat.st_mtime_ns}-{stat.st_size}".encode()).hexdigest()
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return None
+            self._etag = etag
+        return super().send_head()
+
+    def end_headers(self):
+        etag = getattr(self, '_etag', None)
+        if etag:
+            self.send_header('ETag', etag)
+            self._etag = None
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(directory, latency=0.0):
+    """Serve a directory on an ephemeral localhost port and return (server, base_url)"""
+    handler_class = type('Handler', (CachingRequestHandler,), {'latency': latency})
+    handler = partial(handler_class, directory=directory)
+    server = BenchmarkServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def create_fixture_images(directory, count, size_kb):
+    """Write `count` files of random bytes named as JPEGs"""
+    for i in range(count):
+        with open(os.path.join(directory, f"image_{i:05d}.jpg"), 'wb') as f:
+            f.write(os.urandom(size_kb * 1024))
+    return [f"image_{i:05d}.jpg" for i in range(count)]
+
+
+def report(label, elapsed, count, total_bytes):
+    rate = count / elapsed if elapsed else float('inf')
+    mb_per_s = total_bytes / (1024 * 1024) / elapsed if elapsed else float('inf')
+    print(f"{label:<28} {elapsed:8.3f}s  {rate:8.1f} images/s  {mb_per_s:8.1f} MB/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    latency_ms = float(sys.argv[4]) if len(sys.argv) > 4 else 20.0
+
+    work_dir = tempfile.mkdtemp(prefix="download_bench_")
+    serve_dir = os.path.join(work_dir, "serve")
+    out_dir = os.path.join(work_dir, "sequential")
+    cache_dir = os.path.join(work_dir, "cache")
+    os.makedirs(serve_dir)
+    os.makedirs(out_dir)
+
+    names = create_fixture_images(serve_dir, count, size_kb)
+    server, base_url = start_server(serve_dir, latency=latency_ms / 1000)
+    urls = [f"{base_url}/{name}" for name in names]
+    total_bytes = count * size_kb * 1024
+
+    print(f"Downloader benchmark: {count} images x {size_kb} KB, {workers} workers, {latency_ms:g} ms latency")
+    print("=" * 72)
+    try:
+        start = time.perf_counter()
+        for url, name in zip(urls, names):
+            download_image(url, os.path.join(out_dir, name))
+        report("sequential download_image", time.perf_counter() - start, count, total_bytes)
+
+        start = time.perf_counter()
+        statuses = [status for _, _, status in download_all(urls, cache_dir, max_workers=workers)]
+        report("download_all (cold cache)", time.perf_counter() - start, count, total_bytes)
+        print(f"  downloaded={statuses.count('downloaded')} cached={statuses.count('cached')}")
+
+        start = time.perf_counter()
+        statuses = [status for _, _, status in download_all(urls, cache_dir, max_workers=workers)]
+        report("download_all (warm cache)", time.perf_counter() - start, count, total_bytes)
+        print(f"  downloaded={statuses.count('downloaded')} cached={statuses.count('cached')}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Concurrent Image Downloader with HTTP Caching
+
+This module downloads images for the Image Recognition demo. Compared to a
+plain requests.get() call it:
+- streams each response body to disk in chunks instead of buffering it in memory
+- reuses pooled connections through a shared requests.Session
+- downloads many URLs concurrently with a thread pool
+- keeps a local cache keyed by URL and revalidates it with ETag/Last-Modified,
+  so unchanged images are not fetched again
+
+It can also be run directly on a manifest of URLs (one per line); every image
+is handed to the recognition stage as soon as its download finishes.
+
+Usage:
+    python image_downloader.py urls.txt [cache_dir]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Make the helpers shared by all demos (../common) importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.tracing import span, traced
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_CACHE_DIR = ".image_cache"
+DEFAULT_WORKERS = 8
+
+
+def create_session(pool_size=DEFAULT_WORKERS):
+    """
+    Create a requests.Session with a connection pool sized for concurrent downloads
+
+    Args:
+        pool_size (int): Maximum number of pooled connections per host
+
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def stream_to_file(response, local_path):
+    """
+    Write a streamed response body to disk in chunks
+
+    The body is written to a uniquely named temporary file first and moved
+    into place once complete, so an interrupted download never leaves a
+    truncated image behind and concurrent downloads of the same path don't
+    overwrite each other's partial data.
+
+    Args:
+        response (requests.Response): Response opened with stream=True
+        local_path (str): Destination path
+
+    Returns:
+        int: Number of bytes written
+    """
+    directory, name = os.path.split(os.path.abspath(local_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".part", dir=directory)
+    written = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    written += len(chunk)
+        os.replace(tmp_path, local_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+
+
+class DownloadCache:
+    """
+    URL-keyed on-disk cache storing validators (ETag/Last-Modified) per image
+
+    The index is a small JSON file inside the cache directory. All methods are
+    safe to call from several download threads.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._entries = {}
+        if os.path.exists(self._index_path):
+            try:
+                with open(self._index_path, 'r') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable cache index: {e}")
+
+    def path_for(self, url):
+        """Return the local file path used to cache the given URL"""
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        if ext not in ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp'):
+            ext = '.jpg'
+        return os.path.join(self.cache_dir, digest + ext)
+
+    def lookup(self, url):
+        """Return the cache entry for a URL if its file is still on disk"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry and os.path.exists(entry['path']):
+            return entry
+        return None
+
+    def store(self, url, path, etag=None, last_modified=None):
+        """Record the validators for a freshly downloaded URL"""
+        with self._lock:
+            self._entries[url] = {
+                'path': path,
+                'etag': etag,
+                'last_modified': last_modified,
+            }
+
+    def save(self):
+        """Persist the cache index to disk"""
+        with self._lock:
+            tmp_path = self._index_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self._index_path)
+
+
+@traced('download.fetch')
+def fetch(session, url, cache, timeout=30):
+    """
+    Download a single URL into the cache, revalidating any cached copy
+
+    Args:
+        session (requests.Session): Session used for the request
+        url (str): URL of the image
+        cache (DownloadCache): Cache to read validators from and store into
+        timeout (int): Request timeout in seconds
+
+    Returns:
+        tuple: (local_path, status) where status is 'downloaded' or 'cached'
+    """
+    headers = {}
+    entry = cache.lookup(url)
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if entry and response.status_code == 304:
+            return entry['path'], 'cached'
+        response.raise_for_status()
+        local_path = cache.path_for(url)
+        with span('download.write') as write_span:
+            write_span.add_bytes(stream_to_file(response, local_path))
+        cache.store(url, local_path,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'))
+        return local_path, 'downloaded'
+
+
+def download_all(urls, cache_dir=DEFAULT_CACHE_DIR, max_workers=DEFAULT_WORKERS, timeout=30):
+    """
+    Download many URLs concurrently over a pooled session
+
+    Results are yielded in completion order so the caller can start working
+    on an image while the remaining downloads are still in flight. A URL
+    listed several times is downloaded once and yielded once per entry.
+
+    Args:
+        urls (list): URLs to download
+        cache_dir (str): Directory used for the download cache
+        max_workers (int): Number of concurrent downloads
+        timeout (int): Per-request timeout in seconds
+
+    Yields:
+        tuple: (url, local_path, status); local_path is None and status holds
+        the error message when a download fails
+    """
+    cache = DownloadCache(cache_dir)
+    session = create_session(pool_size=max_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            counts = {}
+            for url in urls:
+                counts[url] = counts.get(url, 0) + 1
+            futures = {executor.submit(fetch, session, url, cache, timeout): url for url in counts}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    local_path, status = future.result()
+                except Exception as e:
+                    local_path, status = None, f"error: {e}"
+                for _ in range(counts[url]):
+                    yield url, local_path, status
+    finally:
+        cache.save()
+        session.close()
+
+
+def read_manifest(manifest_path):
+    """
+    Read a URL manifest, one URL per line
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        manifest_path (str): Path to the manifest file
+
+    Returns:
+        list: URLs in manifest order
+    """
+    with open(manifest_path, 'r') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+
+def main():
+    """
+    Download every image in a URL manifest and run image recognition on each
+    """
+    if len(sys.argv) < 2:
+        print("Usage: python image_downloader.py <urls.txt> [cache_dir]")
+        sys.exit(1)
+
+    from image_recognition_demo import load_config, create_image_client, recognize_image, print_results
+
+    urls = read_manifest(sys.argv[1])
+    cache_dir = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CACHE_DIR
+
+    ak, sk, region = load_config()
+    try:
+        client = create_image_client(ak, sk, region)
+    except Exception as e:
+        print(f"Error creating client: {e}")
+        sys.exit(1)
+
+    print(f"Downloading {len(urls)} images into {cache_dir}...")
+    for url, local_path, status in download_all(urls, cache_dir):
+        print(f"\n[{status}] {url}")
+        if local_path is None:
+            continue
+        print_results(recognize_image(client, local_path))
+
+    print("\nDemo completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,11 +14,13 @@ Requirements:
 import os
 import sys
 from dotenv import load_dotenv
-from huaweicloudsdkcore.auth.credentials import BasicCredentials
 from huaweicloudsdkcore.exceptions import exceptions
-from huaweicloudsdkimage.v2 import ImageClient
-from huaweicloudsdkimage.v2.region.image_region import ImageRegion
-import requests
+from image_downloader import DownloadCache, create_session, fetch, stream_to_file
+
+# Make the helpers shared by all demos (../common) importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.huawei_clients import get_client
+from common.tracing import span, traced
 
 
 def load_config():
@@ -44,6 +46,9 @@ def create_image_client(ak, sk, region):
     """
     Create and return an ImageClient instance for Huawei Cloud Image Recognition service
     
+    The client comes from the shared registry in common/huawei_clients.py, so
+    repeated calls with the same settings reuse one client and connection pool.
+    
     Args:
         ak (str): Access Key
         sk (str): Secret Key
@@ -52,20 +57,16 @@ def create_image_client(ak, sk, region):
     Returns:
         ImageClient: Configured client for Image Recognition service
     """
-    credentials = BasicCredentials(ak, sk)
-    # Updated to use the correct method for specifying region in newer SDK versions
-    region_obj = ImageRegion.value_of(region)
-    client = ImageClient.new_builder() \
-        .with_credentials(credentials) \
-        .with_region(region_obj) \
-        .build()
-    return client
+    return get_client('image', region=region, ak=ak, sk=sk)
 
 
+@traced('download_image')
 def download_image(image_url, local_path):
     """
     Download an image from a URL to a local file
     
+    The response body is streamed to disk in chunks rather than buffered in memory.
+    
     Args:
         image_url (str): URL of the image to download
         local_path (str): Local path to save the image
@@ -74,16 +75,18 @@ def download_image(image_url, local_path):
         bool: True if successful, False otherwise
     """
     try:
-        response = requests.get(image_url, timeout=30)
-        response.raise_for_status()
-        with open(local_path, 'wb') as f:
-            f.write(response.content)
+        with create_session(pool_size=1) as session:
+            with session.get(image_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                with span('download_image.write') as write_span:
+                    write_span.add_bytes(stream_to_file(response, local_path))
         return True
     except Exception as e:
         print(f"Error downloading image: {e}")
         return False
 
 
+@traced('recognize_image')
 def recognize_image(client, image_path):
     """
     Perform image recognition on a local image file
@@ -103,15 +106,21 @@ def recognize_image(client, image_path):
         import base64
         
         # Read and encode the image as base64
-        with open(image_path, 'rb') as image_file:
-            image_data = base64.b64encode(image_file.read()).decode('utf-8')
+        with span('recognize_image.read') as read_span:
+            with open(image_path, 'rb') as image_file:
+                raw_data = image_file.read()
+            read_span.add_bytes(len(raw_data))
+        with span('recognize_image.encode'):
+            image_data = base64.b64encode(raw_data).decode('utf-8')
         
         # Create the request with the base64 encoded image
         # Set language to 'en' for English results
         request_body = ImageTaggingReq(image=image_data, language='en')
         request = RunImageTaggingRequest(body=request_body)
         
-        response = client.run_image_tagging(request)
+        with span('recognize_image.request') as request_span:
+            request_span.add_bytes(len(image_data))
+            response = client.run_image_tagging(request)
         return response.to_dict()
     
     except exceptions.ClientRequestException as e:
@@ -176,10 +185,18 @@ def main():
         print(f"\nNo image specified. Using default: {image_path}")
         print("Downloading sample image for demo...")
         
-        # Download a sample image if it doesn't exist
+        # Download a sample image if it doesn't exist, reusing the cached copy
+        # when the server reports it unchanged (ETag/Last-Modified)
         if not os.path.exists(image_path):
             sample_url = "https://images.unsplash.com/photo-1500462918059-b1a0cb512f1d?ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D&auto=format&fit=crop&w=1000&q=80"
-            if not download_image(sample_url, image_path):
+            cache = DownloadCache()
+            try:
+                with create_session(pool_size=1) as session:
+                    image_path, status = fetch(session, sample_url, cache)
+                cache.save()
+                print(f"Sample image {status}: {image_path}")
+            except Exception as e:
+                print(f"Error downloading image: {e}")
                 print("Failed to download sample image. Please provide your own image.")
                 sys.exit(1)
     
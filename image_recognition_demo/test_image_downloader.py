@@ -0,0 +1,56 @@
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from benchmark_downloader import start_server
+from image_downloader import DownloadCache, create_session, download_all, fetch
+
+
+class TestImageDownloader(unittest.TestCase):
+
+    def setUp(self):
+        self.serve_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.image_path = os.path.join(self.serve_dir.name, 'image.jpg')
+        with open(self.image_path, 'wb') as f:
+            f.write(b'first version')
+        self.server, base_url = start_server(self.serve_dir.name)
+        self.url = f"{base_url}/image.jpg"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.serve_dir.cleanup()
+        self.cache_dir.cleanup()
+
+    def test_fetch_downloads_revalidates_and_refreshes(self):
+        """Test a cold download, a 304 cache hit and a re-download after the content changes"""
+        cache = DownloadCache(self.cache_dir.name)
+        with create_session(pool_size=1) as session:
+            path, status = fetch(session, self.url, cache)
+            self.assertEqual(status, 'downloaded')
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b'first version')
+
+            self.assertEqual(fetch(session, self.url, cache), (path, 'cached'))
+
+            with open(self.image_path, 'wb') as f:
+                f.write(b'second, longer version')
+            path, status = fetch(session, self.url, cache)
+            self.assertEqual(status, 'downloaded')
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b'second, longer version')
+
+    def test_repeated_urls_download_once(self):
+        """Test that a URL listed several times yields one result per entry without races"""
+        results = list(download_all([self.url] * 8, cache_dir=self.cache_dir.name, max_workers=8))
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual({status for _, _, status in results}, {'downloaded'})
+        self.assertEqual([name for name in os.listdir(self.cache_dir.name) if name.endswith('.part')], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
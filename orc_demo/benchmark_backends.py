@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compare OCR backends on a fixture corpus.
+
+Reports latency percentiles, total cost and accuracy (1 - character error
+rate against the ground truth) for the local, cloud and routed backends.
+
+The corpus is a JSON lines manifest with one object per image:
+    {"file": "images/0001.jpg", "text": "expected text"}
+File paths are relative to the manifest, and lines without a "file" key
+(such as the header written by generate_test_corpus.py) are skipped.
+Without a manifest the bundled
+test_image.jpg is used.
+
+Backends that cannot run (no Tesseract installed, no cloud credentials) are
+skipped.
+
+Usage:
+    python benchmark_backends.py [manifest.jsonl] [--backends local,cloud,auto] [--limit N]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from ocr_backends import CloudOcrBackend, RoutedOcrBackend, TesseractBackend
+
+DEFAULT_CORPUS = [('test_image.jpg', "Hello, Huawei Cloud OCR!")]
+
+
+def load_corpus(manifest_path, limit=None):
+    """Return a list of (image_path, expected_text) pairs."""
+    if not manifest_path:
+        here = os.path.dirname(os.path.abspath(__file__))
+        return [(os.path.join(here, name), text) for name, text in DEFAULT_CORPUS]
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    corpus = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if 'file' not in entry:
+                # Header line of a generated corpus
+                continue
+            corpus.append((os.path.join(base_dir, entry['file']), entry['text']))
+            if limit and len(corpus) >= limit:
+                break
+    return corpus
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two strings."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def normalize(text):
+    """Collapse whitespace so line breaks and spacing don't count as errors."""
+    return " ".join(text.split())
+
+
+def accuracy(expected, actual):
+    """1 - character error rate, clamped to [0, 1]."""
+    expected, actual = normalize(expected), normalize(actual)
+    if not expected:
+        return 1.0 if not actual else 0.0
+    return max(0.0, 1.0 - edit_distance(expected, actual) / len(expected))
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_backend(backend, corpus):
+    """Run one backend over the corpus and return its summary row."""
+    latencies, scores, failures = [], [], 0
+    for image_path, expected in corpus:
+        start = time.perf_counter()
+        result = backend.recognize(image_path)
+        latencies.append(time.perf_counter() - start)
+        if result is None:
+            failures += 1
+            scores.append(0.0)
+        else:
+            scores.append(accuracy(expected, result.text))
+
+    if isinstance(backend, RoutedOcrBackend):
+        cost = backend.cost
+    else:
+        cost = backend.cost_per_call * len(corpus)
+    return {
+        'backend': backend.name,
+        'images': len(corpus),
+        'failures': failures,
+        'latency_p50_ms': percentile(latencies, 50) * 1000,
+        'latency_p95_ms': percentile(latencies, 95) * 1000,
+        'total_seconds': sum(latencies),
+        'total_cost': cost,
+        'accuracy': sum(scores) / len(scores) if scores else 0.0,
+        'routes': dict(backend.routes) if isinstance(backend, RoutedOcrBackend) else None,
+    }
+
+
+def build_backends(names):
+    """Create the requested backends, skipping those that cannot run here."""
+    backends = []
+    local = TesseractBackend()
+    client = None
+    if 'cloud' in names or 'auto' in names:
+        from ocr_demo import init_ocr_client
+        client = init_ocr_client()
+
+    for name in names:
+        if name == 'local':
+            if local.available():
+                backends.append(local)
+            else:
+                print("Skipping local backend: Tesseract is not installed")
+        elif name == 'cloud':
+            if client:
+                backends.append(CloudOcrBackend(client))
+            else:
+                print("Skipping cloud backend: OCR client could not be initialized")
+        elif name == 'auto':
+            if client:
+                backends.append(RoutedOcrBackend(TesseractBackend(), CloudOcrBackend(client)))
+            else:
+                print("Skipping router backend: OCR client could not be initialized")
+        else:
+            print(f"Skipping unknown backend '{name}'")
+    return backends
+
+
+def print_report(rows):
+    print(f"{'backend':<8} {'images':>6} {'fail':>5} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'cost':>9} {'accuracy':>9}")
+    print("-" * 62)
+    for row in rows:
+        print(f"{row['backend']:<8} {row['images']:>6} {row['failures']:>5} "
+              f"{row['latency_p50_ms']:>9.1f} {row['latency_p95_ms']:>9.1f} "
+              f"{row['total_cost']:>9.3f} {row['accuracy']:>9.3f}")
+        if row['routes']:
+            print(f"         routes: {row['routes']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OCR backends on a fixture corpus.")
+    parser.add_argument('manifest', nargs='?', help="JSON lines manifest of images and expected text")
+    parser.add_argument('--backends', default='local,cloud,auto', help="Comma-separated backends to run")
+    parser.add_argument('--limit', type=int, help="Only use the first N images")
+    parser.add_argument('--json', help="Also write the report rows to this JSON file")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.manifest, args.limit)
+    backends = build_backends([name.strip() for name in args.backends.split(',') if name.strip()])
+    if not backends:
+        print("No backend could be run")
+        return
+
+    print(f"OCR backend benchmark: {len(corpus)} images")
+    print("=" * 62)
+    rows = [run_backend(backend, corpus) for backend in backends]
+    print_report(rows)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
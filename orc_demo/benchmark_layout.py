@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for OCR layout reconstruction on synthetic pages.
+
+Generates multi-column pages of word blocks with jittered geometry, shuffles
+them (the API gives no ordering guarantee) and compares the grid-indexed line
+linking in ocr_layout with a naive all-pairs comparison.
+
+Usage:
+    python benchmark_layout.py [num_blocks] [columns] [seed]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from ocr_layout import blocks_to_arrays, connected_components, reconstruct_layout
+
+
+def make_synthetic_page(num_blocks: int, columns: int = 2, seed: int = 0) -> tuple:
+    """
+    Build a page of word blocks laid out in columns of lines.
+
+    Returns:
+        tuple: (blocks, expected_line_count) where blocks are dicts shaped like
+        GeneralTextWordsBlockList.to_dict()
+    """
+    rng = np.random.default_rng(seed)
+    words_per_line = 8
+    word_width, word_gap, line_height, line_pitch = 60, 12, 20, 32
+    column_width = words_per_line * (word_width + word_gap)
+    gutter = 120
+    lines_per_column = int(np.ceil(num_blocks / (words_per_line * columns)))
+
+    blocks = []
+    for n in range(num_blocks):
+        line, word = divmod(n, words_per_line)
+        column, row = divmod(line, lines_per_column)
+        x0 = column * (column_width + gutter) + word * (word_width + word_gap) + rng.integers(-2, 3)
+        y0 = row * line_pitch + rng.integers(-3, 4)
+        x1, y1 = x0 + word_width + rng.integers(-10, 11), y0 + line_height + rng.integers(-2, 3)
+        blocks.append({
+            'words': f"w{n}",
+            'location': [[int(x0), int(y0)], [int(x1), int(y0)], [int(x1), int(y1)], [int(x0), int(y1)]],
+            'confidence': float(rng.uniform(0.8, 1.0)),
+        })
+    expected_lines = int(np.ceil(num_blocks / words_per_line))
+    order = rng.permutation(num_blocks)
+    return [blocks[i] for i in order], expected_lines
+
+
+def naive_line_labels(boxes: np.ndarray, gap_factor: float = 1.5, overlap_ratio: float = 0.5) -> np.ndarray:
+    """Line linking by comparing every block with every other block"""
+    heights = np.maximum(boxes[:, 3] - boxes[:, 1], 1.0)
+    edges = []
+    for i in range(len(boxes)):
+        overlap_y = np.minimum(boxes[i, 3], boxes[:, 3]) - np.maximum(boxes[i, 1], boxes[:, 1])
+        min_height = np.minimum(heights[i], heights)
+        gap_x = np.maximum(boxes[:, 0] - boxes[i, 2], boxes[i, 0] - boxes[:, 2])
+        linked = np.nonzero((overlap_y >= overlap_ratio * min_height) & (gap_x <= gap_factor * min_height))[0]
+        linked = linked[linked > i]
+        edges.append(np.stack([np.full(len(linked), i), linked], axis=1))
+    return connected_components(len(boxes), np.concatenate(edges))
+
+
+def main():
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    blocks, expected_lines = make_synthetic_page(num_blocks, columns, seed)
+    print(f"Layout benchmark: {num_blocks} blocks, {columns} columns, {expected_lines} lines")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    layout = reconstruct_layout(blocks)
+    elapsed = time.perf_counter() - start
+    print(f"reconstruct_layout (grid index): {elapsed:8.3f}s  "
+          f"lines={len(layout.lines)} regions={layout.region_count}")
+
+    _, boxes, _ = blocks_to_arrays(blocks)
+    start = time.perf_counter()
+    naive_lines = int(naive_line_labels(boxes).max()) + 1
+    elapsed = time.perf_counter() - start
+    print(f"naive all-pairs line linking:    {elapsed:8.3f}s  lines={naive_lines}")
+
+    if len(layout.lines) != expected_lines:
+        print(f"Warning: expected {expected_lines} lines, got {len(layout.lines)}")
+
+
+if __name__ == "__main__":
+    main()
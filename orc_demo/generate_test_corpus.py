@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Generate a synthetic image corpus with ground truth for OCR testing.
+
+Where create_test_image.py renders one fixed image, this script renders any
+number of varied images: random text (one or more lines), fonts, font sizes,
+colors, rotation and noise. Images are rendered across a process pool and
+described in a JSON lines manifest. The first line records how the corpus
+was made, each following line describes one image:
+
+    {"corpus": {"seed": 42, "count": 10000, "fonts": ["DejaVuSans.ttf", ...],
+                "max_lines": 4, ...}}
+    {"file": "images/000000.jpg", "text": "...", "width": ..., "height": ...,
+     "font": "DejaVuSans.ttf", "font_size": 28, "rotation": -3.5, "noise": 6.0,
+     "lines": [{"text": "...", "bbox": [[x, y], [x, y], [x, y], [x, y]]}]}
+
+Each `bbox` is the line's quadrilateral in the final (rotated) image, in the
+same corner order as the OCR API's `location`. The manifest works directly
+with benchmark_backends.py.
+
+Every image is rendered from its own random generator seeded with
+(seed, index), so a given seed produces the same corpus whatever the number
+of worker processes. Fonts are picked from a sorted list of the fonts on the
+machine that draw every character the corpus uses; symbol fonts such as
+Wingdings and fonts for other scripts are left out. The same seed gives the
+same corpus on machines whose manifest headers list the same fonts.
+
+Usage:
+    python generate_test_corpus.py --count 10000 --output corpus --seed 42
+"""
+
+import argparse
+import functools
+import glob
+import json
+import math
+import os
+import random
+import string
+import time
+from multiprocessing import Pool
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_DIRS = [
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    os.path.expanduser('~/.fonts'),
+    '/Library/Fonts',
+    '/System/Library/Fonts',
+    'C:\\Windows\\Fonts',
+]
+
+WORDS = [
+    'Huawei', 'Cloud', 'OCR', 'invoice', 'total', 'amount', 'date', 'receipt', 'customer', 'order',
+    'address', 'phone', 'payment', 'balance', 'account', 'service', 'region', 'image', 'text', 'demo',
+    'Santiago', 'Lima', 'Bogota', 'Mexico', 'Buenos', 'Aires', 'Sao', 'Paulo', 'training', 'LATAM',
+    'factura', 'fecha', 'cliente', 'pago', 'precio', 'cantidad', 'producto', 'tienda', 'gracias', 'hola',
+]
+
+# Every character random_line() can produce
+ALPHABET = ''.join(sorted(set(''.join(WORDS)) | set(string.digits) | set('.,:!?')))
+
+# A noncharacter, which every font draws with its .notdef (missing glyph) box
+MISSING_CHARACTER = '\uffff'
+
+
+def covers_alphabet(font_path, alphabet=ALPHABET):
+    """
+    Return whether a font has a visible glyph of its own for every character.
+
+    A character is missing when the font draws it exactly like its .notdef
+    glyph, or draws nothing at all.
+    """
+    try:
+        font = ImageFont.truetype(font_path, 32)
+    except OSError:
+        return False
+
+    def glyph(character):
+        mask = font.getmask(character)
+        return mask.size, bytes(mask)
+
+    missing = glyph(MISSING_CHARACTER)
+    for character in alphabet:
+        shape = glyph(character)
+        if shape == missing or not any(shape[1]):
+            return False
+    return True
+
+
+def find_fonts(extra_dirs=None, alphabet=ALPHABET):
+    """Return a sorted list of the TrueType/OpenType font files on this machine that cover the alphabet."""
+    fonts = set()
+    for directory in list(extra_dirs or []) + FONT_DIRS:
+        for pattern in ('*.ttf', '*.otf', '*.TTF', '*.OTF'):
+            fonts.update(glob.glob(os.path.join(directory, '**', pattern), recursive=True))
+    return [font for font in sorted(fonts) if covers_alphabet(font, alphabet)]
+
+
+@functools.lru_cache(maxsize=256)
+def load_font(font_path, size):
+    """Load a font, falling back to Pillow's built-in font."""
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            pass
+    try:
+        # Pillow 10.1+ can scale the built-in font
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def random_line(rng):
+    """Return a line of random words, occasionally mixed with numbers and punctuation."""
+    parts = []
+    for _ in range(rng.randint(1, 6)):
+        roll = rng.random()
+        if roll < 0.15:
+            parts.append(str(rng.randint(1, 99999)))
+        elif roll < 0.25:
+            parts.append(f"{rng.randint(1, 999)}.{rng.randint(0, 99):02d}")
+        else:
+            parts.append(rng.choice(WORDS))
+    line = ' '.join(parts)
+    if rng.random() < 0.3:
+        line += rng.choice(['.', ',', ':', '!', '?'])
+    return line
+
+
+def rotate_point(x, y, angle, old_size, new_size):
+    """Map a point through Image.rotate(angle, expand=True)."""
+    theta = math.radians(angle)
+    dx, dy = x - old_size[0] / 2.0, y - old_size[1] / 2.0
+    rx = dx * math.cos(theta) + dy * math.sin(theta)
+    ry = -dx * math.sin(theta) + dy * math.cos(theta)
+    return [int(round(rx + new_size[0] / 2.0)), int(round(ry + new_size[1] / 2.0))]
+
+
+def render_image(task):
+    """
+    Render one corpus image and return its manifest entry.
+
+    Args:
+        task (tuple): (index, seed, output_dir, fonts, options)
+
+    Returns:
+        dict: Manifest entry for the image
+    """
+    index, seed, output_dir, fonts, options = task
+    rng = random.Random(f"{seed}-{index}")
+
+    font_path = rng.choice(fonts) if fonts else None
+    font_size = rng.randint(options['min_font_size'], options['max_font_size'])
+    font = load_font(font_path, font_size)
+    lines = [random_line(rng) for _ in range(rng.randint(1, options['max_lines']))]
+
+    # Lay the lines out on an unrotated canvas with random margins
+    measure = ImageDraw.Draw(Image.new('L', (1, 1)))
+    spacing = int(font_size * rng.uniform(0.3, 0.8))
+    offsets = []
+    text_width = text_height = 0
+    for line in lines:
+        offsets.append(text_height)
+        _, _, right, bottom = measure.textbbox((0, text_height), line, font=font)
+        text_width = max(text_width, right)
+        text_height = bottom + spacing
+    text_height -= spacing
+    margin_x = rng.randint(10, 80)
+    margin_y = rng.randint(10, 60)
+    size = (text_width + 2 * margin_x, text_height + 2 * margin_y)
+
+    background = tuple(rng.randint(200, 255) for _ in range(3))
+    foreground = tuple(rng.randint(0, 70) for _ in range(3))
+    image = Image.new('RGB', size, color=background)
+    draw = ImageDraw.Draw(image)
+    ground_truth = []
+    for line, offset in zip(lines, offsets):
+        position = (margin_x, margin_y + offset)
+        draw.text(position, line, fill=foreground, font=font)
+        ground_truth.append({'text': line, 'box': draw.textbbox(position, line, font=font)})
+
+    # Rotate, then map each line box to a quadrilateral in the rotated image
+    rotation = round(rng.uniform(-options['max_rotation'], options['max_rotation']), 2)
+    if rotation:
+        rotated = image.rotate(rotation, resample=Image.BICUBIC, expand=True, fillcolor=background)
+    else:
+        rotated = image
+    for entry in ground_truth:
+        left, top, right, bottom = entry.pop('box')
+        corners = [(left, top), (right, top), (right, bottom), (left, bottom)]
+        entry['bbox'] = [rotate_point(x, y, rotation, image.size, rotated.size) for x, y in corners]
+
+    noise = round(rng.uniform(0, options['max_noise']), 2)
+    if noise:
+        noise_rng = np.random.default_rng([seed, index])
+        pixels = np.asarray(rotated, dtype=np.float32)
+        pixels += noise_rng.standard_normal(pixels.shape, dtype=np.float32) * noise
+        rotated = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+    name = f"{index:06d}.jpg"
+    rotated.save(os.path.join(output_dir, 'images', name), quality=rng.randint(70, 95))
+
+    return {
+        'file': f"images/{name}",
+        'text': "\n".join(lines),
+        'width': rotated.size[0],
+        'height': rotated.size[1],
+        'font': os.path.basename(font_path) if font_path else 'default',
+        'font_size': font_size,
+        'rotation': rotation,
+        'noise': noise,
+        'lines': ground_truth,
+    }
+
+
+def generate_corpus(count, output_dir, seed=0, workers=None, fonts=None, **options):
+    """
+    Render `count` images into output_dir/images and write output_dir/manifest.jsonl.
+
+    Args:
+        count (int): Number of images
+        output_dir (str): Output directory
+        seed (int): Corpus seed
+        workers (int): Worker processes (default: CPU count)
+        fonts (list): Font files to choose from, in any order (default: find_fonts())
+        **options: max_lines, min_font_size, max_font_size, max_rotation, max_noise
+
+    Returns:
+        str: Path of the manifest
+    """
+    settings = {'max_lines': 4, 'min_font_size': 14, 'max_font_size': 48, 'max_rotation': 10.0, 'max_noise': 12.0}
+    settings.update({key: value for key, value in options.items() if value is not None})
+    fonts = find_fonts() if fonts is None else sorted(fonts)
+
+    os.makedirs(os.path.join(output_dir, 'images'), exist_ok=True)
+    manifest_path = os.path.join(output_dir, 'manifest.jsonl')
+    tasks = ((index, seed, output_dir, fonts, settings) for index in range(count))
+
+    header = {'seed': seed, 'count': count, 'fonts': [os.path.basename(font) for font in fonts] or ['default']}
+    header.update(settings)
+
+    with open(manifest_path, 'w', encoding='utf-8') as manifest:
+        manifest.write(json.dumps({'corpus': header}, ensure_ascii=False) + "\n")
+        if workers == 1:
+            results = map(render_image, tasks)
+            for entry in results:
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        else:
+            with Pool(processes=workers) as pool:
+                for entry in pool.imap(render_image, tasks, chunksize=32):
+                    manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return manifest_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic OCR test corpus with ground truth.")
+    parser.add_argument('--count', type=int, default=1000, help="Number of images (default: 1000)")
+    parser.add_argument('--output', default='corpus', help="Output directory (default: corpus)")
+    parser.add_argument('--seed', type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--fonts', action='append', help="Extra directory to search for fonts (repeatable)")
+    parser.add_argument('--max-lines', type=int, help="Maximum lines per image (default: 4)")
+    parser.add_argument('--min-font-size', type=int, help="Minimum font size (default: 14)")
+    parser.add_argument('--max-font-size', type=int, help="Maximum font size (default: 48)")
+    parser.add_argument('--max-rotation', type=float, help="Maximum rotation in degrees (default: 10)")
+    parser.add_argument('--max-noise', type=float, help="Maximum Gaussian noise sigma (default: 12)")
+    args = parser.parse_args()
+
+    fonts = find_fonts(args.fonts)
+    if not fonts:
+        print("Warning: no TrueType fonts covering the corpus text found, using Pillow's built-in font")
+    else:
+        print(f"Using {len(fonts)} fonts: {', '.join(os.path.basename(font) for font in fonts)}")
+
+    start = time.perf_counter()
+    manifest_path = generate_corpus(
+        args.count, args.output, seed=args.seed, workers=args.workers, fonts=fonts,
+        max_lines=args.max_lines, min_font_size=args.min_font_size, max_font_size=args.max_font_size,
+        max_rotation=args.max_rotation, max_noise=args.max_noise)
+    elapsed = time.perf_counter() - start
+    print(f"Generated {args.count} images in {elapsed:.1f}s ({args.count / elapsed:.0f} images/s)")
+    print(f"Manifest: {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
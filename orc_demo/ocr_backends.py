@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pluggable OCR backends
+
+Every backend takes an image path and returns a result with the same shape as
+the SDK's GeneralTextResult (direction, words_block_count, words_block_list
+of blocks with words/confidence/location), so print_ocr_result() and
+ocr_layout work with any of them.
+
+- CloudOcrBackend: Huawei Cloud OCR (network latency, billed per call)
+- TesseractBackend: local Tesseract engine through pytesseract (optional)
+- RoutedOcrBackend: sends clean, high-contrast images to the local engine
+  and escalates to the cloud when the local result looks unreliable
+
+Costs are expressed per call in whatever unit you configure (for example your
+contracted price per OCR request); they are only used for reporting.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+from PIL import Image
+
+
+class TextBlock(NamedTuple):
+    """A recognized text block, mirroring GeneralTextWordsBlockList"""
+    words: str
+    confidence: float
+    location: List[List[int]]
+
+
+class OcrResult(NamedTuple):
+    """Backend-independent OCR result, mirroring GeneralTextResult"""
+    direction: float
+    words_block_count: int
+    words_block_list: List[TextBlock]
+    backend: str
+
+    @property
+    def text(self) -> str:
+        return "\n".join(block.words for block in self.words_block_list)
+
+    @property
+    def mean_confidence(self) -> float:
+        """Character-weighted mean confidence, 0.0 for an empty result"""
+        weights = [max(len(block.words), 1) for block in self.words_block_list]
+        if not weights:
+            return 0.0
+        return sum(block.confidence * w for block, w in zip(self.words_block_list, weights)) / sum(weights)
+
+
+class OcrBackend(ABC):
+    """
+    Base class for OCR backends.
+
+    Subclasses implement recognize() and set `name` and `cost_per_call`.
+    """
+
+    name = "base"
+    cost_per_call = 0.0
+
+    @abstractmethod
+    def recognize(self, image_path: str) -> Optional[OcrResult]:
+        """Recognize text in an image, returning None on failure."""
+
+    def available(self) -> bool:
+        """Return True if the backend can be used in this environment."""
+        return True
+
+
+class CloudOcrBackend(OcrBackend):
+    """
+    Huawei Cloud general text OCR.
+
+    Args:
+        client (OcrClient): Initialized OCR client, see ocr_demo.init_ocr_client()
+        cost_per_call (float): Cost of one API call, defaults to the
+            OCR_CLOUD_COST_PER_CALL environment variable or 1.0
+    """
+
+    name = "cloud"
+
+    def __init__(self, client, cost_per_call: Optional[float] = None):
+        self.client = client
+        if cost_per_call is None:
+            cost_per_call = float(os.getenv('OCR_CLOUD_COST_PER_CALL', '1.0'))
+        self.cost_per_call = cost_per_call
+
+    def recognize(self, image_path: str) -> Optional[OcrResult]:
+        from ocr_demo import recognize_text_from_image
+
+        result = recognize_text_from_image(self.client, image_path)
+        if result is None:
+            return None
+        blocks = [TextBlock(words=block.words or "", confidence=float(block.confidence or 0.0),
+                            location=block.location or [])
+                  for block in (result.words_block_list or [])]
+        return OcrResult(direction=result.direction or 0.0, words_block_count=len(blocks),
+                         words_block_list=blocks, backend=self.name)
+
+
+class TesseractBackend(OcrBackend):
+    """
+    Local OCR with Tesseract.
+
+    Words are grouped into one block per Tesseract line, matching the
+    line-level blocks returned by the cloud API. Confidences are scaled
+    to 0..1.
+
+    Args:
+        lang (str): Tesseract language code(s), e.g. 'eng' or 'eng+spa'
+        config (str): Extra Tesseract command line options
+        cost_per_call (float): Cost of one local call (CPU time), default 0
+    """
+
+    name = "local"
+
+    def __init__(self, lang: str = 'eng', config: str = '', cost_per_call: float = 0.0):
+        self.lang = lang
+        self.config = config
+        self.cost_per_call = cost_per_call
+        self._available = None
+
+    def available(self) -> bool:
+        if self._available is None:
+            self._available = pytesseract is not None
+            if self._available:
+                try:
+                    pytesseract.get_tesseract_version()
+                except Exception:
+                    self._available = False
+        return self._available
+
+    def recognize(self, image_path: str) -> Optional[OcrResult]:
+        if pytesseract is None:
+            print("Error: pytesseract is not installed. Install it with: pip install pytesseract")
+            return None
+        try:
+            with Image.open(image_path) as image:
+                data = pytesseract.image_to_data(image, lang=self.lang, config=self.config,
+                                                 output_type=pytesseract.Output.DICT)
+        except Exception as e:
+            print(f"Local OCR error: {e}")
+            return None
+
+        lines: Dict[tuple, dict] = {}
+        for i, word in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            if not word.strip() or confidence < 0:
+                continue
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            x0, y0 = data['left'][i], data['top'][i]
+            x1, y1 = x0 + data['width'][i], y0 + data['height'][i]
+            line = lines.setdefault(key, {'words': [], 'confidences': [], 'box': [x0, y0, x1, y1]})
+            line['words'].append(word)
+            line['confidences'].append(confidence / 100.0)
+            box = line['box']
+            box[0], box[1] = min(box[0], x0), min(box[1], y0)
+            box[2], box[3] = max(box[2], x1), max(box[3], y1)
+
+        blocks = []
+        for line in lines.values():
+            x0, y0, x1, y1 = line['box']
+            blocks.append(TextBlock(words=" ".join(line['words']),
+                                    confidence=sum(line['confidences']) / len(line['confidences']),
+                                    location=[[x0, y0], [x1, y0], [x1, y1], [x0, y1]]))
+        return OcrResult(direction=0.0, words_block_count=len(blocks),
+                         words_block_list=blocks, backend=self.name)
+
+
+def extreme_pixel_ratio(image_path: str, sample_size: int = 512) -> float:
+    """
+    Fraction of pixels that are near black or near white.
+
+    Scanned documents and rendered text score close to 1.0; photos and
+    low-contrast scans score lower. Computed on a downscaled grayscale copy.
+    """
+    with Image.open(image_path) as image:
+        gray = image.convert('L')
+        gray.thumbnail((sample_size, sample_size))
+        histogram = gray.histogram()
+    total = sum(histogram)
+    if not total:
+        return 0.0
+    return (sum(histogram[:64]) + sum(histogram[192:])) / total
+
+
+class RoutedOcrBackend(OcrBackend):
+    """
+    Cost-aware router between a local and a cloud backend.
+
+    Easy images (mostly black-and-white pixels) go to the local backend first.
+    The result is escalated to the cloud backend when the local call fails,
+    finds no text, or its mean confidence is below `min_confidence`. If the
+    escalated cloud call then fails, the local result is returned anyway and
+    counted under 'fallback'. Every other image goes straight to the cloud.
+
+    Args:
+        local (OcrBackend): Cheap backend tried first on easy images
+        cloud (OcrBackend): Accurate backend used for hard images and escalations
+        easy_threshold (float): Minimum extreme_pixel_ratio() for an easy image
+        min_confidence (float): Minimum local mean confidence to accept
+    """
+
+    name = "router"
+
+    def __init__(self, local: OcrBackend, cloud: OcrBackend,
+                 easy_threshold: float = 0.9, min_confidence: float = 0.8):
+        self.local = local
+        self.cloud = cloud
+        self.easy_threshold = easy_threshold
+        self.min_confidence = min_confidence
+        self.routes = {'local': 0, 'cloud': 0, 'escalated': 0, 'fallback': 0}
+        self.cost = 0.0
+
+    @property
+    def cost_per_call(self) -> float:
+        calls = sum(self.routes.values())
+        return self.cost / calls if calls else 0.0
+
+    def is_easy(self, image_path: str) -> bool:
+        try:
+            return extreme_pixel_ratio(image_path) >= self.easy_threshold
+        except Exception:
+            return False
+
+    def recognize(self, image_path: str) -> Optional[OcrResult]:
+        if not (self.local.available() and self.is_easy(image_path)):
+            self.routes['cloud'] += 1
+            self.cost += self.cloud.cost_per_call
+            return self.cloud.recognize(image_path)
+
+        local_result = self.local.recognize(image_path)
+        self.cost += self.local.cost_per_call
+        if (local_result is not None and local_result.words_block_list
+                and local_result.mean_confidence >= self.min_confidence):
+            self.routes['local'] += 1
+            return local_result
+
+        self.cost += self.cloud.cost_per_call
+        result = self.cloud.recognize(image_path)
+        if result is None and local_result is not None:
+            # A low-confidence local result beats no result at all
+            self.routes['fallback'] += 1
+            return local_result
+        self.routes['escalated'] += 1
+        return result
+
+
+def create_backend(name: str, client=None) -> OcrBackend:
+    """
+    Build a backend by name: 'cloud', 'local' or 'auto' (router).
+
+    Args:
+        name (str): Backend name
+        client (OcrClient): OCR client, required for 'cloud' and 'auto'
+
+    Returns:
+        OcrBackend: The requested backend
+    """
+    if name == 'local':
+        return TesseractBackend()
+    if name == 'cloud':
+        return CloudOcrBackend(client)
+    if name == 'auto':
+        return RoutedOcrBackend(TesseractBackend(), CloudOcrBackend(client))
+    raise ValueError(f"Unknown OCR backend '{name}', expected cloud, local or auto")
+
@@ -25,55 +25,63 @@ if os.path.exists('.env'):
     from dotenv import load_dotenv
     load_dotenv()
 
-from huaweicloudsdkcore.auth.credentials import BasicCredentials
 from huaweicloudsdkcore.exceptions import exceptions
 from huaweicloudsdkocr.v1 import OcrClient
 from huaweicloudsdkocr.v1.model import *
-from huaweicloudsdkocr.v1.region.ocr_region import OcrRegion
 
+# Make the helpers shared by all demos (../common) importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.huawei_clients import env_credentials, get_client, resolve_region
+from common.tracing import span, traced
 
-def init_ocr_client() -> Optional[OcrClient]:
+from ocr_backends import create_backend
+from ocr_layout import print_layout_result, reconstruct_layout
+
+
+def get_ocr_region() -> str:
     """
-    Initialize the OCR client with credentials.
+    Return the configured OCR region, or AP_SOUTHEAST_1 if it is not valid for OCR.
     
     Returns:
-        OcrClient: Initialized OCR client or None if initialization fails.
+        str: Region name
     """
-    # Get credentials from environment variables
-    ak = os.getenv('HUAWEICLOUD_SDK_AK')
-    sk = os.getenv('HUAWEICLOUD_SDK_SK')
-    region = os.getenv('HUAWEICLOUD_SDK_REGION', 'AP_SOUTHEAST_1')
-    project_id = os.getenv('HUAWEICLOUD_SDK_PROJECT_ID')  # Optional project ID
-    
-    if not ak or not sk:
-        print("Error: Please set HUAWEICLOUD_SDK_AK and HUAWEICLOUD_SDK_SK environment variables")
-        return None
-    
-    # Configure credentials
-    credentials = BasicCredentials(ak, sk)
-    if project_id:
-        credentials = BasicCredentials(ak, sk, project_id)
-    
-    # Initialize OCR client
     # You may need to change the region according to your Huawei Cloud account settings
     # For Hong Kong, consider using AP_SOUTHEAST_1, AP_SOUTHEAST_2, or AP_SOUTHEAST_3
-    # Convert region string to proper format
-    region = region.upper().replace('-', '_')
+    region = env_credentials('ocr')['region'] or 'AP_SOUTHEAST_1'
     try:
-        ocr_region = getattr(OcrRegion, region)
-    except AttributeError:
+        resolve_region('ocr', region)
+    except ValueError:
         print(f"Warning: Invalid region '{region}', using AP_SOUTHEAST_1 as default")
-        ocr_region = OcrRegion.AP_SOUTHEAST_1
+        region = 'AP_SOUTHEAST_1'
+    return region
+
+
+def init_ocr_client(region: Optional[str] = None) -> Optional[OcrClient]:
+    """
+    Initialize the OCR client with credentials.
     
-    client_builder = OcrClient.new_builder() \
-        .with_credentials(credentials) \
-        .with_region(ocr_region)
+    The client comes from the shared registry in common/huawei_clients.py, so
+    every caller in the process reuses one client and connection pool.
+    
+    Args:
+        region (str): Region to use (default: get_ocr_region())
     
-    client = client_builder.build()
+    Returns:
+        OcrClient: Initialized OCR client or None if initialization fails.
+    """
+    # Credentials and the optional region and project ID come from HUAWEICLOUD_SDK_AK,
+    # HUAWEICLOUD_SDK_SK, HUAWEICLOUD_SDK_REGION and HUAWEICLOUD_SDK_PROJECT_ID, or, when
+    # HUAWEICLOUD_SDK_AK is not set, from the matching HUAWEI_CLOUD_* variables
+    credentials = env_credentials('ocr')
+    if not credentials['ak'] or not credentials['sk']:
+        print("Error: Please set HUAWEICLOUD_SDK_AK and HUAWEICLOUD_SDK_SK environment variables "
+              "(or HUAWEI_CLOUD_ACCESS_KEY and HUAWEI_CLOUD_SECRET_KEY)")
+        return None
     
-    return client
+    return get_client('ocr', region=region or get_ocr_region())
 
 
+@traced('recognize_text_from_image')
 def recognize_text_from_image(client: OcrClient, image_path: str) -> Optional[GeneralTextResult]:
     """
     Recognize text from an image using Huawei Cloud OCR.
@@ -92,19 +100,43 @@ def recognize_text_from_image(client: OcrClient, image_path: str) -> Optional[Ge
             return None
             
         # Read image file as binary
-        with open(image_path, 'rb') as f:
-            image_data = f.read()
+        with span('recognize_text_from_image.read') as read_span:
+            with open(image_path, 'rb') as f:
+                image_data = f.read()
+            read_span.add_bytes(len(image_data))
             
         # Encode image data as base64
         import base64
-        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        with span('recognize_text_from_image.encode'):
+            image_base64 = base64.b64encode(image_data).decode('utf-8')
         
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        return None
+    
+    return recognize_text_from_base64(client, image_base64)
+
+
+def recognize_text_from_base64(client: OcrClient, image_base64: str) -> Optional[GeneralTextResult]:
+    """
+    Recognize text from a base64 encoded image using Huawei Cloud OCR.
+    
+    Args:
+        client (OcrClient): Initialized OCR client
+        image_base64 (str): Base64 encoded image data
+        
+    Returns:
+        GeneralTextResult: OCR result or None if recognition fails
+    """
+    try:
         # Create request
         request = RecognizeGeneralTextRequest()
         request.body = GeneralTextRequestBody(image=image_base64)
         
         # Call OCR API
-        response = client.recognize_general_text(request)
+        with span('recognize_text.request') as request_span:
+            request_span.add_bytes(len(image_base64))
+            response = client.recognize_general_text(request)
         
         return response.result
         
@@ -143,24 +175,46 @@ def print_ocr_result(result: GeneralTextResult):
 def main():
     """Main function to run the OCR demo."""
     # Check command line arguments
-    if len(sys.argv) != 2:
-        print("Usage: python ocr_demo.py <image_path>")
+    args = sys.argv[1:]
+    use_layout = '--layout' in args
+    if use_layout:
+        args.remove('--layout')
+    backend_name = os.getenv('OCR_BACKEND', 'cloud')
+    if '--backend' in args:
+        index = args.index('--backend')
+        backend_name = args[index + 1] if index + 1 < len(args) else ''
+        del args[index:index + 2]
+    if len(args) != 1 or backend_name not in ('cloud', 'local', 'auto'):
+        print("Usage: python ocr_demo.py [--layout] [--backend cloud|local|auto] <image_path>")
         print("Example: python ocr_demo.py sample.jpg")
+        print("  --layout   print text as reconstructed lines in reading order")
+        print("  --backend  cloud (default), local (Tesseract) or auto (local first, cloud fallback)")
         sys.exit(1)
         
-    image_path = sys.argv[1]
+    image_path = args[0]
     
-    # Initialize OCR client
-    client = init_ocr_client()
-    if not client:
-        sys.exit(1)
+    # Initialize OCR client (not needed for the local backend)
+    client = None
+    if backend_name != 'local':
+        client = init_ocr_client()
+        if not client:
+            sys.exit(1)
         
     # Perform OCR
     print(f"Performing OCR on image: {image_path}")
-    result = recognize_text_from_image(client, image_path)
+    if backend_name == 'cloud':
+        result = recognize_text_from_image(client, image_path)
+    else:
+        backend = create_backend(backend_name, client)
+        result = backend.recognize(image_path)
+        if result is not None:
+            print(f"Recognized by: {result.backend}")
     
     # Print result
-    print_ocr_result(result)
+    if use_layout and result and result.words_block_list:
+        print_layout_result(reconstruct_layout(result.words_block_list))
+    else:
+        print_ocr_result(result)
 
 
 if __name__ == "__main__":
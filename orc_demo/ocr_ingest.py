@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Directory-watching OCR ingestion daemon
+
+Watches a directory for new or changed images and runs Huawei Cloud OCR on
+each one, writing the result as JSON to an output directory. Intended for
+folders that receive a steady stream of scans.
+
+- New files are detected with inotify on Linux, or by polling the directory
+  when inotify is not available.
+- A small SQLite state database records the SHA-256 of every processed file,
+  so restarts and touched-but-unchanged files do not trigger new OCR calls.
+- Work flows through read -> preprocess -> OCR -> write stages connected by
+  bounded queues. When OCR falls behind, the queues fill up and the upstream
+  stages block (backpressure) instead of reading the whole folder into memory.
+- Throughput and queue depths are printed periodically and can be written to
+  a JSON stats file.
+
+Usage:
+    python ocr_ingest.py <watch_dir> [--output DIR] [--workers N] [--poll]
+"""
+
+import argparse
+import base64
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import queue
+import select
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Make the helpers shared by all demos (../common) importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+STATE_DB_NAME = '.ocr_ingest.db'
+
+_STOP = object()
+
+
+def is_image_file(path: str) -> bool:
+    """Return True for files with a supported image extension."""
+    return path.lower().endswith(IMAGE_EXTENSIONS) and not os.path.basename(path).startswith('.')
+
+
+def scan_directory(directory: str) -> List[str]:
+    """Return every image file currently in the directory."""
+    with os.scandir(directory) as entries:
+        return sorted(entry.path for entry in entries if entry.is_file() and is_image_file(entry.name))
+
+
+class InotifyWatcher:
+    """
+    Report files that were closed after writing or moved into a directory.
+
+    Uses the Linux inotify API through ctypes, so no extra package is needed.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_Q_OVERFLOW = 0x00004000
+    _EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        watch = libc.inotify_add_watch(self._fd, os.fsencode(directory),
+                                       self.IN_CLOSE_WRITE | self.IN_MOVED_TO)
+        if watch < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def poll(self, timeout: float) -> List[str]:
+        """Wait up to `timeout` seconds and return the image files that changed."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, name_len = self._EVENT_HEADER.unpack_from(data, offset)
+            offset += self._EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            if mask & self.IN_Q_OVERFLOW:
+                # Events were dropped by the kernel; fall back to a full scan
+                return scan_directory(self.directory)
+            if name:
+                path = os.path.join(self.directory, os.fsdecode(name))
+                if is_image_file(path) and path not in paths:
+                    paths.append(path)
+        return paths
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """
+    Report new or changed files by scanning the directory periodically.
+
+    A file is only reported once its size and modification time are the same
+    on two consecutive scans, so files that are still being copied are skipped.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._previous: Dict[str, tuple] = {}
+        self._reported: Dict[str, tuple] = {}
+        # Files present at startup are covered by the initial scan
+        self.poll(0)
+        self._reported = dict(self._previous)
+
+    def poll(self, timeout: float) -> List[str]:
+        """Sleep `timeout` seconds, rescan and return files that settled since the last call."""
+        time.sleep(timeout)
+        current = {}
+        for path in scan_directory(self.directory):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            current[path] = (stat.st_size, stat.st_mtime_ns)
+
+        changed = [path for path, signature in current.items()
+                   if self._previous.get(path) == signature and self._reported.get(path) != signature]
+        for path in changed:
+            self._reported[path] = current[path]
+        self._previous = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(directory: str, force_polling: bool = False):
+    """Return an inotify watcher when available, otherwise a polling watcher."""
+    if not force_polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(directory)
+
+
+class StateDB:
+    """
+    SQLite record of processed files.
+
+    A file is skipped when its size and mtime match the stored row, or when its
+    content hash matches (e.g. it was touched or copied over unchanged).
+    """
+
+    def __init__(self, db_path: str):
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS processed ("
+                " path TEXT PRIMARY KEY,"
+                " sha256 TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " status TEXT NOT NULL,"
+                " processed_at REAL NOT NULL)"
+            )
+
+    def lookup(self, path: str) -> Optional[tuple]:
+        """Return (sha256, size, mtime_ns, status) for a path, or None."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT sha256, size, mtime_ns, status FROM processed WHERE path = ?", (path,)
+            ).fetchone()
+
+    def record(self, path: str, sha256: str, size: int, mtime_ns: int, status: str):
+        """Insert or update the row for a processed file."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO processed (path, sha256, size, mtime_ns, status, processed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (path, sha256, size, mtime_ns, status, time.time())
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class IngestStats:
+    """Thread-safe counters for the ingestion pipeline."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.counters = {'discovered': 0, 'skipped': 0, 'processed': 0, 'failed': 0, 'bytes': 0}
+        self.busy_seconds: Dict[str, float] = {}
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def add_busy(self, stage: str, seconds: float):
+        with self._lock:
+            self.busy_seconds[stage] = self.busy_seconds.get(stage, 0.0) + seconds
+
+    def snapshot(self, queues: Dict[str, queue.Queue]) -> dict:
+        """Return counters, throughput and current queue depths."""
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            counters = dict(self.counters)
+            busy = dict(self.busy_seconds)
+        return {
+            'elapsed_seconds': round(elapsed, 3),
+            **counters,
+            'files_per_second': round(counters['processed'] / elapsed, 3) if elapsed else 0.0,
+            'queue_depth': {name: q.qsize() for name, q in queues.items()},
+            'stage_busy_seconds': {name: round(seconds, 3) for name, seconds in busy.items()},
+        }
+
+
+class IngestPipeline:
+    """
+    Bounded read -> preprocess -> OCR -> write pipeline fed by a directory watcher.
+
+    Args:
+        watch_dir (str): Directory to watch for images
+        output_dir (str): Directory that receives one JSON result per image
+        recognize (callable): Takes base64 image data and returns a
+            JSON-serializable result, or None on failure
+        state_path (str): SQLite state database path
+        workers (int): Number of concurrent OCR calls
+        queue_size (int): Capacity of each inter-stage queue
+        force_polling (bool): Use the polling watcher even if inotify works
+        poll_interval (float): Seconds between watcher polls
+    """
+
+    def __init__(self, watch_dir: str, output_dir: str, recognize: Callable[[str], Optional[dict]],
+                 state_path: Optional[str] = None, workers: int = 4, queue_size: int = 16,
+                 force_polling: bool = False, poll_interval: float = 1.0):
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.output_dir = output_dir
+        self.recognize = recognize
+        self.workers = workers
+        self.force_polling = force_polling
+        self.poll_interval = poll_interval
+        self.state = StateDB(state_path or os.path.join(self.watch_dir, STATE_DB_NAME))
+        self.stats = IngestStats()
+        self.queues = {
+            'read': queue.Queue(maxsize=queue_size),
+            'preprocess': queue.Queue(maxsize=queue_size),
+            'ocr': queue.Queue(maxsize=queue_size),
+            'write': queue.Queue(maxsize=queue_size),
+        }
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stages: List[tuple] = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    # -- stages ---------------------------------------------------------------
+
+    def _read(self, path):
+        """Skip unchanged, successfully processed files; otherwise load the bytes and hash them."""
+        try:
+            stat = os.stat(path)
+            row = self.state.lookup(path)
+            if row and row[1] == stat.st_size and row[2] == stat.st_mtime_ns and row[3] == 'ok':
+                return None
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        if row and row[0] == digest and row[3] == 'ok':
+            self.state.record(path, digest, stat.st_size, stat.st_mtime_ns, 'ok')
+            return None
+        self.stats.increment('bytes', len(data))
+        return {'path': path, 'data': data, 'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def _preprocess(self, item):
+        item['image_base64'] = base64.b64encode(item.pop('data')).decode('utf-8')
+        return item
+
+    def _ocr(self, item):
+        item['result'] = self.recognize(item.pop('image_base64'))
+        return item
+
+    def _write(self, item):
+        path = item['path']
+        status = 'ok' if item['result'] is not None else 'failed'
+        if status == 'ok':
+            # Keep the extension so scan.jpg and scan.png don't share an output file
+            name = os.path.basename(path) + '.json'
+            output_path = os.path.join(self.output_dir, name)
+            tmp_path = output_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'source': path, 'sha256': item['sha256'], 'result': item['result']},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, output_path)
+            self.stats.increment('processed')
+        else:
+            self.stats.increment('failed')
+        self.state.record(path, item['sha256'], item['size'], item['mtime_ns'], status)
+        return None
+
+    def _run_stage(self, name, func, input_queue, output_queue):
+        while True:
+            item = input_queue.get()
+            if item is _STOP:
+                return
+            path = item if isinstance(item, str) else item['path']
+            start = time.perf_counter()
+            try:
+                result = func(item)
+                if result is None and name == 'read':
+                    self.stats.increment('skipped')
+            except Exception as e:
+                print(f"Error in {name} stage for {path}: {e}")
+                self.stats.increment('failed')
+                result = None
+            self.stats.add_busy(name, time.perf_counter() - start)
+            if result is None:
+                self._finish(path)
+            elif output_queue is not None:
+                output_queue.put(result)
+
+    def _finish(self, path):
+        with self._in_flight_lock:
+            self._in_flight.discard(path)
+
+    def _finish_write(self, item):
+        try:
+            return self._write(item)
+        finally:
+            self._finish(item['path'])
+
+    # -- control --------------------------------------------------------------
+
+    def submit(self, path: str):
+        """Queue a file unless it is already being processed. Blocks when the pipeline is full."""
+        with self._in_flight_lock:
+            if path in self._in_flight:
+                return
+            self._in_flight.add(path)
+        self.stats.increment('discovered')
+        self.queues['read'].put(path)
+
+    def start(self):
+        """Start the stage threads."""
+        layout = [
+            ('read', self._read, 'read', 'preprocess', 1),
+            ('preprocess', self._preprocess, 'preprocess', 'ocr', 1),
+            ('ocr', self._ocr, 'ocr', 'write', self.workers),
+            ('write', self._finish_write, 'write', None, 1),
+        ]
+        for name, func, input_name, output_name, count in layout:
+            threads = []
+            for i in range(count):
+                thread = threading.Thread(
+                    target=self._run_stage,
+                    args=(name, func, self.queues[input_name],
+                          self.queues[output_name] if output_name else None),
+                    name=f"ingest-{name}-{i}", daemon=True)
+                thread.start()
+                threads.append(thread)
+            self._stages.append((input_name, threads))
+
+    def stop(self):
+        """Drain the queues stage by stage and stop all threads."""
+        self._stopping.set()
+        for input_name, threads in self._stages:
+            for _ in threads:
+                self.queues[input_name].put(_STOP)
+            for thread in threads:
+                thread.join()
+        self._stages = []
+        self.state.close()
+
+    def run(self, stats_interval: float = 10.0, stats_path: Optional[str] = None,
+            run_once: bool = False):
+        """
+        Process existing files, then watch the directory until interrupted.
+
+        Args:
+            stats_interval (float): Seconds between stats reports
+            stats_path (str): Optional JSON file rewritten with every report
+            run_once (bool): Stop after the existing files are processed
+        """
+        self.start()
+        watcher = None
+        try:
+            # Start watching before the initial scan so no file slips in between
+            if not run_once:
+                watcher = create_watcher(self.watch_dir, self.force_polling)
+            for path in scan_directory(self.watch_dir):
+                self.submit(path)
+            if run_once:
+                return
+            print(f"Watching {self.watch_dir} ({type(watcher).__name__})")
+            next_report = time.monotonic() + stats_interval
+            while not self._stopping.is_set():
+                for path in watcher.poll(self.poll_interval):
+                    self.submit(path)
+                if time.monotonic() >= next_report:
+                    self.report(stats_path)
+                    next_report = time.monotonic() + stats_interval
+        finally:
+            if watcher:
+                watcher.close()
+            self.stop()
+            self.report(stats_path)
+
+    def report(self, stats_path: Optional[str] = None):
+        """Print a one-line stats summary and optionally write the full snapshot."""
+        snapshot = self.stats.snapshot(self.queues)
+        depths = ' '.join(f"{name}={depth}" for name, depth in snapshot['queue_depth'].items())
+        print(f"[stats] processed={snapshot['processed']} skipped={snapshot['skipped']} "
+              f"failed={snapshot['failed']} rate={snapshot['files_per_second']:.2f}/s queues: {depths}")
+        if stats_path:
+            with open(stats_path, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+        return snapshot
+
+
+def main():
+    """Main function to run the OCR ingestion daemon."""
+    parser = argparse.ArgumentParser(description="Watch a directory and OCR every new or changed image.")
+    parser.add_argument('watch_dir', help="Directory to watch for images")
+    parser.add_argument('--output', default='ocr_output', help="Directory for JSON results (default: ocr_output)")
+    parser.add_argument('--state', help=f"State database path (default: <watch_dir>/{STATE_DB_NAME})")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent OCR requests (default: 4)")
+    parser.add_argument('--queue-size', type=int, default=16, help="Capacity of each stage queue (default: 16)")
+    parser.add_argument('--poll', action='store_true', help="Poll the directory instead of using inotify")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds between polls (default: 1)")
+    parser.add_argument('--stats-interval', type=float, default=10.0, help="Seconds between stats reports")
+    parser.add_argument('--stats-file', help="Write the latest stats snapshot to this JSON file")
+    parser.add_argument('--once', action='store_true', help="Process existing files and exit")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.watch_dir):
+        print(f"Error: Directory {args.watch_dir} not found")
+        sys.exit(1)
+
+    from common.huawei_clients import warm_up
+    from ocr_demo import get_ocr_region, init_ocr_client, recognize_text_from_base64
+
+    region = get_ocr_region()
+    client = init_ocr_client(region)
+    if not client:
+        sys.exit(1)
+    # Open the connection to the OCR endpoint before the first file arrives
+    for service, outcome in warm_up(['ocr'], region=region).items():
+        if isinstance(outcome, str):
+            print(f"Warning: could not warm up the {service} client: {outcome}")
+
+    def recognize(image_base64):
+        result = recognize_text_from_base64(client, image_base64)
+        return result.to_dict() if result is not None else None
+
+    pipeline = IngestPipeline(args.watch_dir, args.output, recognize, state_path=args.state,
+                              workers=args.workers, queue_size=args.queue_size,
+                              force_polling=args.poll, poll_interval=args.poll_interval)
+    try:
+        pipeline.run(stats_interval=args.stats_interval, stats_path=args.stats_file, run_once=args.once)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Layout reconstruction for Huawei Cloud OCR word blocks
+
+The general text API returns word blocks in no guaranteed reading order. This
+module rebuilds the page layout from the block geometry:
+1. Block quadrilaterals are loaded into NumPy arrays as axis-aligned boxes.
+2. A uniform grid index finds candidate neighbours, so only blocks that share
+   a grid cell are compared instead of every pair of blocks on the page.
+3. Neighbouring blocks on the same baseline are linked into lines, and
+   vertically adjacent, horizontally overlapping lines into text regions
+   (columns / paragraphs). A line that sits on top of (or under) two separate
+   columns, such as a heading spanning the page, is not linked to either, so
+   it cannot join the columns into one region. Connected components are
+   labelled with vectorized label propagation.
+4. Side-by-side regions whose lines pair up one-for-one on the same baselines
+   with a wide gap between them (receipt items and prices, form labels and
+   values) are merged into a table, which is read row by row.
+5. Regions are ordered left-to-right by column band and top-to-bottom within a
+   band, which gives the reading order for multi-column pages.
+Blocks without a location cannot be placed; each becomes a line of its own in
+a final region after all the others.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+class LayoutLine(NamedTuple):
+    """A reconstructed line of text"""
+    text: str
+    confidence: float
+    box: Optional[tuple]  # (x0, y0, x1, y1), None for a block without a location
+    region: int
+    block_indices: List[int]
+
+
+class LayoutResult(NamedTuple):
+    """Lines in reading order plus the number of detected text regions"""
+    lines: List[LayoutLine]
+    region_count: int
+
+    @property
+    def text(self) -> str:
+        """Ordered page text, with a blank line between regions"""
+        parts = []
+        previous_region = None
+        for line in self.lines:
+            if previous_region is not None and line.region != previous_region:
+                parts.append("")
+            parts.append(line.text)
+            previous_region = line.region
+        return "\n".join(parts)
+
+
+def _block_field(block, name):
+    if isinstance(block, dict):
+        return block.get(name)
+    return getattr(block, name, None)
+
+
+def blocks_to_arrays(words_block_list: Sequence) -> tuple:
+    """
+    Load word block geometry into NumPy arrays.
+
+    Args:
+        words_block_list: Word blocks from GeneralTextResult.words_block_list,
+            either SDK model objects or their to_dict() form
+
+    Returns:
+        tuple: (texts, boxes, confidences) where boxes is an (n, 4) float array
+        of (x0, y0, x1, y1) and confidences is an (n,) float array. The box
+        spans only the corner points actually given; a block without any
+        location gets a row of NaN.
+    """
+    count = len(words_block_list)
+    texts = []
+    boxes = np.full((count, 4), np.nan, dtype=np.float64)
+    confidences = np.zeros(count, dtype=np.float64)
+    for i, block in enumerate(words_block_list):
+        texts.append(_block_field(block, 'words') or "")
+        location = _block_field(block, 'location')
+        if location:
+            corners = np.asarray(location[:4], dtype=np.float64).reshape(-1, 2)
+            boxes[i, 0:2] = corners.min(axis=0)
+            boxes[i, 2:4] = corners.max(axis=0)
+        confidences[i] = _block_field(block, 'confidence') or 0.0
+    return texts, boxes, confidences
+
+
+class GridIndex:
+    """
+    Uniform grid spatial index over axis-aligned boxes.
+
+    Every box is registered in each cell it overlaps. Entries are kept sorted
+    by cell key (CSR layout), so both point queries and the enumeration of
+    candidate pairs are linear in the number of entries rather than quadratic
+    in the number of boxes.
+    """
+
+    def __init__(self, boxes: np.ndarray, cell_size: float):
+        self.boxes = boxes
+        self.cell_size = float(max(cell_size, 1.0))
+
+        cells = np.floor(boxes / self.cell_size).astype(np.int64)
+        self._origin = cells[:, 0:2].min(axis=0) if len(boxes) else np.zeros(2, dtype=np.int64)
+        cells[:, 0:2] -= self._origin
+        cells[:, 2:4] -= self._origin
+        self._columns = int(cells[:, 2].max()) + 1 if len(boxes) else 1
+
+        span_x = cells[:, 2] - cells[:, 0] + 1
+        span_y = cells[:, 3] - cells[:, 1] + 1
+        per_box = span_x * span_y
+        box_ids = np.repeat(np.arange(len(boxes)), per_box)
+
+        # Offset of each entry within its own box's cell span
+        starts = np.repeat(np.cumsum(per_box) - per_box, per_box)
+        local = np.arange(len(box_ids)) - starts
+        cell_x = cells[box_ids, 0] + local % span_x[box_ids]
+        cell_y = cells[box_ids, 1] + local // span_x[box_ids]
+        keys = cell_y * self._columns + cell_x
+
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._ids = box_ids[order]
+
+    def query(self, box: Sequence[float]) -> np.ndarray:
+        """Return the indices of boxes that may intersect the given box"""
+        x0, y0, x1, y1 = (np.floor(np.asarray(box, dtype=np.float64) / self.cell_size).astype(np.int64)
+                          - np.tile(self._origin, 2))
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1 = min(x1, self._columns - 1)
+        found = []
+        for cy in range(y0, y1 + 1):
+            lo = np.searchsorted(self._keys, cy * self._columns + x0, side='left')
+            hi = np.searchsorted(self._keys, cy * self._columns + x1, side='right')
+            found.append(self._ids[lo:hi])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def candidate_pairs(self) -> np.ndarray:
+        """
+        Return unique (i, j) pairs, i < j, of boxes that share at least one cell.
+
+        Returns:
+            np.ndarray: (m, 2) array of box index pairs
+        """
+        keys, ids = self._keys, self._ids
+        pairs = []
+        offset = 1
+        while offset < len(keys):
+            same_cell = keys[offset:] == keys[:-offset]
+            if not same_cell.any():
+                break
+            first = ids[:-offset][same_cell]
+            second = ids[offset:][same_cell]
+            pairs.append(np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1))
+            offset += 1
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = np.concatenate(pairs)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        return np.unique(pairs, axis=0)
+
+
+def connected_components(count: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Label connected components of an undirected graph.
+
+    Uses min-label propagation with pointer jumping, so each iteration is a
+    handful of vectorized operations over the edge list.
+
+    Args:
+        count (int): Number of nodes
+        pairs (np.ndarray): (m, 2) edge array
+
+    Returns:
+        np.ndarray: Component label per node, renumbered to 0..k-1
+    """
+    labels = np.arange(count)
+    if len(pairs):
+        a, b = pairs[:, 0], pairs[:, 1]
+        while True:
+            previous = labels.copy()
+            low = np.minimum(labels[a], labels[b])
+            np.minimum.at(labels, a, low)
+            np.minimum.at(labels, b, low)
+            labels = labels[labels]
+            if np.array_equal(labels, previous):
+                break
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def _link_lines(boxes, index, heights, gap_factor, overlap_ratio):
+    """Pairs of blocks that sit on the same line and are close horizontally"""
+    pairs = index.candidate_pairs()
+    if not len(pairs):
+        return pairs
+    a, b = pairs[:, 0], pairs[:, 1]
+    overlap_y = np.minimum(boxes[a, 3], boxes[b, 3]) - np.maximum(boxes[a, 1], boxes[b, 1])
+    min_height = np.minimum(heights[a], heights[b])
+    gap_x = np.maximum(boxes[b, 0] - boxes[a, 2], boxes[a, 0] - boxes[b, 2])
+    keep = (overlap_y >= overlap_ratio * min_height) & (gap_x <= gap_factor * min_height)
+    return pairs[keep]
+
+
+def _link_regions(line_boxes, index, heights, line_gap_factor):
+    """Pairs of lines that are stacked vertically and overlap horizontally"""
+    pairs = index.candidate_pairs()
+    if not len(pairs):
+        return pairs
+    a, b = pairs[:, 0], pairs[:, 1]
+    overlap_x = np.minimum(line_boxes[a, 2], line_boxes[b, 2]) - np.maximum(line_boxes[a, 0], line_boxes[b, 0])
+    min_width = np.minimum(line_boxes[a, 2] - line_boxes[a, 0], line_boxes[b, 2] - line_boxes[b, 0])
+    gap_y = np.maximum(line_boxes[b, 1] - line_boxes[a, 3], line_boxes[a, 1] - line_boxes[b, 3])
+    min_height = np.minimum(heights[a], heights[b])
+    keep = (overlap_x >= 0.3 * min_width) & (gap_y <= line_gap_factor * min_height)
+    return _drop_bridges(line_boxes, pairs[keep])
+
+
+def _drop_bridges(line_boxes, pairs):
+    """
+    Remove the links of lines that touch two separate columns.
+
+    A line linked to two lines below it that do not overlap each other
+    horizontally (a heading over two columns), or to two such lines above it,
+    keeps none of the links on that side.
+    """
+    if not len(pairs):
+        return pairs
+    a, b = pairs[:, 0], pairs[:, 1]
+    a_above = line_boxes[a, 1] + line_boxes[a, 3] <= line_boxes[b, 1] + line_boxes[b, 3]
+    upper = np.where(a_above, a, b)
+    lower = np.where(a_above, b, a)
+
+    def touches_disjoint(line, other):
+        # Some two of the other lines are disjoint when the leftmost right
+        # edge lies before the rightmost left edge
+        min_right = np.full(len(line_boxes), np.inf)
+        max_left = np.full(len(line_boxes), -np.inf)
+        np.minimum.at(min_right, line, line_boxes[other, 2])
+        np.maximum.at(max_left, line, line_boxes[other, 0])
+        return min_right < max_left
+
+    keep = ~touches_disjoint(upper, lower)[upper] & ~touches_disjoint(lower, upper)[lower]
+    return pairs[keep]
+
+
+def _rows_in_regions(line_boxes, region_labels):
+    """Order of lines within their region (top-to-bottom, then left-to-right) and line count per region"""
+    order = np.lexsort((line_boxes[:, 0], line_boxes[:, 1], region_labels))
+    sorted_regions = region_labels[order]
+    rows = np.empty(len(order), dtype=np.int64)
+    rows[order] = np.arange(len(order)) - np.searchsorted(sorted_regions, sorted_regions, side='left')
+    return rows, order, np.bincount(region_labels)
+
+
+def _link_tables(line_boxes, region_labels, region_boxes, overlap_ratio):
+    """
+    Pairs of regions that are columns of one table.
+
+    Two regions qualify when they sit side by side with a gap of at least half
+    the narrower region's width, have the same number of lines, and each line
+    shares its baseline with the line of the same row in the other region.
+    Text columns separated by a narrow gutter are left alone.
+    """
+    region_count = len(region_boxes)
+    if region_count < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    _, order, line_counts = _rows_in_regions(line_boxes, region_labels)
+    starts = np.cumsum(line_counts) - line_counts
+
+    # Only regions with overlapping vertical extents can share rows; sweeping
+    # them in order of their top edge keeps this linear in the output size
+    by_top = np.argsort(region_boxes[:, 1], kind='stable')
+    tops = region_boxes[by_top, 1]
+    ends = np.searchsorted(tops, region_boxes[by_top, 3], side='left')
+    following = np.maximum(ends - np.arange(1, region_count + 1), 0)
+    a = np.repeat(np.arange(region_count), following)
+    b = a + 1 + np.arange(len(a)) - np.repeat(np.cumsum(following) - following, following)
+    a, b = by_top[a], by_top[b]
+
+    widths = region_boxes[:, 2] - region_boxes[:, 0]
+    gap_x = np.maximum(region_boxes[b, 0] - region_boxes[a, 2], region_boxes[a, 0] - region_boxes[b, 2])
+    overlap_y = np.minimum(region_boxes[a, 3], region_boxes[b, 3]) - np.maximum(region_boxes[a, 1], region_boxes[b, 1])
+    candidates = ((line_counts[a] == line_counts[b]) & (overlap_y > 0)
+                  & (gap_x > 0) & (gap_x >= 0.5 * np.minimum(widths[a], widths[b])))
+
+    pairs = []
+    for first, second in zip(a[candidates].tolist(), b[candidates].tolist()):
+        rows_a = line_boxes[order[starts[first]:starts[first] + line_counts[first]]]
+        rows_b = line_boxes[order[starts[second]:starts[second] + line_counts[second]]]
+        overlap = np.minimum(rows_a[:, 3], rows_b[:, 3]) - np.maximum(rows_a[:, 1], rows_b[:, 1])
+        min_height = np.minimum(rows_a[:, 3] - rows_a[:, 1], rows_b[:, 3] - rows_b[:, 1])
+        if (overlap >= overlap_ratio * min_height).all():
+            pairs.append((first, second))
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def _group_boxes(boxes, labels, group_count):
+    """Bounding box of each labelled group"""
+    grouped = np.empty((group_count, 4), dtype=np.float64)
+    grouped[:, 0:2] = np.inf
+    grouped[:, 2:4] = -np.inf
+    np.minimum.at(grouped[:, 0], labels, boxes[:, 0])
+    np.minimum.at(grouped[:, 1], labels, boxes[:, 1])
+    np.maximum.at(grouped[:, 2], labels, boxes[:, 2])
+    np.maximum.at(grouped[:, 3], labels, boxes[:, 3])
+    return grouped
+
+
+def _column_bands(region_boxes):
+    """Assign regions to left-to-right bands of horizontally overlapping regions"""
+    order = np.argsort(region_boxes[:, 0], kind='stable')
+    starts = region_boxes[order, 0]
+    ends = np.maximum.accumulate(region_boxes[order, 2])
+    new_band = np.ones(len(order), dtype=bool)
+    new_band[1:] = starts[1:] > ends[:-1]
+    bands = np.empty(len(order), dtype=np.int64)
+    bands[order] = np.cumsum(new_band) - 1
+    return bands
+
+
+def _layout_lines(texts, boxes, confidences, gap_factor, overlap_ratio, line_gap_factor):
+    """Lines in reading order and region count for blocks that all have a box"""
+    count = len(texts)
+    if count == 0:
+        return [], 0
+
+    heights = np.maximum(boxes[:, 3] - boxes[:, 1], 1.0)
+    cell_size = (1.0 + gap_factor) * float(np.median(heights))
+
+    # Blocks -> lines. Boxes are padded by the allowed gap so that blocks close
+    # enough to be linked always share a grid cell.
+    pad = np.stack([-gap_factor * heights, np.zeros(count), gap_factor * heights, np.zeros(count)], axis=1)
+    block_index = GridIndex(boxes + pad * 0.5, cell_size)
+    line_labels = connected_components(count, _link_lines(boxes, block_index, heights, gap_factor, overlap_ratio))
+    line_count = int(line_labels.max()) + 1
+    line_boxes = _group_boxes(boxes, line_labels, line_count)
+    line_heights = np.maximum(line_boxes[:, 3] - line_boxes[:, 1], 1.0)
+
+    # Lines -> regions
+    pad = np.stack([np.zeros(line_count), -line_gap_factor * line_heights,
+                    np.zeros(line_count), line_gap_factor * line_heights], axis=1)
+    line_index = GridIndex(line_boxes + pad * 0.5, (1.0 + line_gap_factor) * float(np.median(line_heights)))
+    region_labels = connected_components(line_count, _link_regions(line_boxes, line_index, line_heights,
+                                                                    line_gap_factor))
+    region_count = int(region_labels.max()) + 1
+    region_boxes = _group_boxes(line_boxes, region_labels, region_count)
+
+    # Row of each line within its region. Regions merged into a table keep
+    # their own rows, which line up across the table's columns.
+    rows, _, _ = _rows_in_regions(line_boxes, region_labels)
+    table_pairs = _link_tables(line_boxes, region_labels, region_boxes, overlap_ratio)
+    if len(table_pairs):
+        region_labels = connected_components(region_count, table_pairs)[region_labels]
+        region_count = int(region_labels.max()) + 1
+        region_boxes = _group_boxes(line_boxes, region_labels, region_count)
+
+    # Reading order: column band, then top-to-bottom, then left-to-right
+    row_unit = float(np.median(line_heights))
+    bands = _column_bands(region_boxes)
+    region_order = np.lexsort((region_boxes[:, 0], np.floor(region_boxes[:, 1] / row_unit), bands))
+    region_rank = np.empty(region_count, dtype=np.int64)
+    region_rank[region_order] = np.arange(region_count)
+
+    line_rank_key = np.lexsort((line_boxes[:, 0], rows, region_rank[region_labels]))
+
+    # Per-line confidence, weighted by the number of characters in each block
+    weights = np.array([max(len(t), 1) for t in texts], dtype=np.float64)
+    line_confidence = (np.bincount(line_labels, weights=confidences * weights, minlength=line_count)
+                       / np.bincount(line_labels, weights=weights, minlength=line_count))
+
+    block_order = np.lexsort((boxes[:, 0], line_labels))
+    members: Dict[int, List[int]] = {}
+    for block in block_order.tolist():
+        members.setdefault(int(line_labels[block]), []).append(block)
+
+    lines = []
+    for line in line_rank_key.tolist():
+        block_ids = members[line]
+        lines.append(LayoutLine(
+            text=" ".join(texts[i] for i in block_ids),
+            confidence=float(line_confidence[line]),
+            box=tuple(float(v) for v in line_boxes[line]),
+            region=int(region_rank[region_labels[line]]),
+            block_indices=block_ids,
+        ))
+    return lines, region_count
+
+
+def reconstruct_layout(words_block_list: Sequence, gap_factor: float = 1.5,
+                       overlap_ratio: float = 0.5, line_gap_factor: float = 1.0) -> LayoutResult:
+    """
+    Rebuild lines, text regions and reading order from OCR word blocks.
+
+    Args:
+        words_block_list: Word blocks from GeneralTextResult.words_block_list
+        gap_factor (float): Largest horizontal gap between blocks of one line,
+            as a multiple of the block height
+        overlap_ratio (float): Minimum vertical overlap, relative to the
+            smaller block height, for two blocks to share a line
+        line_gap_factor (float): Largest vertical gap between lines of one
+            region, as a multiple of the line height
+
+    Returns:
+        LayoutResult: Lines in reading order with per-line confidence
+    """
+    texts, boxes, confidences = blocks_to_arrays(words_block_list)
+    located = np.flatnonzero(~np.isnan(boxes).any(axis=1))
+    lines, region_count = _layout_lines([texts[i] for i in located], boxes[located], confidences[located],
+                                        gap_factor, overlap_ratio, line_gap_factor)
+    lines = [line._replace(block_indices=[int(located[i]) for i in line.block_indices]) for line in lines]
+
+    unlocated = np.flatnonzero(np.isnan(boxes).any(axis=1))
+    for block in unlocated.tolist():
+        lines.append(LayoutLine(text=texts[block], confidence=float(confidences[block]), box=None,
+                                region=region_count, block_indices=[block]))
+    if len(unlocated):
+        region_count += 1
+    return LayoutResult(lines=lines, region_count=region_count)
+
+
+def print_layout_result(layout: LayoutResult):
+    """
+    Print reconstructed lines in reading order.
+
+    Args:
+        layout (LayoutResult): Result of reconstruct_layout()
+    """
+    if not layout.lines:
+        print("No text recognized in the image")
+        return
+
+    print(f"Layout: {len(layout.lines)} lines in {layout.region_count} regions")
+    previous_region = None
+    for i, line in enumerate(layout.lines, 1):
+        if previous_region is not None and line.region != previous_region:
+            print()
+        print(f"{i}. {line.text} (Confidence: {line.confidence:.4f})")
+        previous_region = line.region
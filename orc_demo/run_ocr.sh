@@ -24,9 +24,21 @@ if [[ -z "$HUAWEICLOUD_SDK_AK" || -z "$HUAWEICLOUD_SDK_SK" ]]; then
     fi
 fi
 
+# Watch mode: continuously OCR new or changed images in a directory
+if [[ "$1" == "--watch" ]]; then
+    if [[ ! -d "$2" ]]; then
+        echo "Usage: $0 --watch <directory> [ocr_ingest.py options]"
+        exit 1
+    fi
+    echo "Watching directory: $2"
+    shift
+    exec python ocr_ingest.py "$@"
+fi
+
 # Check if image file is provided
 if [[ -z "$1" ]]; then
     echo "Usage: $0 <image_path>"
+    echo "       $0 --watch <directory> [ocr_ingest.py options]"
     echo "Example: $0 test_image.jpg"
     exit 1
 fi
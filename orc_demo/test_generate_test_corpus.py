@@ -0,0 +1,77 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import generate_test_corpus
+from benchmark_backends import load_corpus
+
+
+class TestGenerateTestCorpus(unittest.TestCase):
+
+    def generate(self, output_dir, workers):
+        manifest_path = generate_test_corpus.generate_corpus(6, output_dir, seed=3, workers=workers)
+        with open(manifest_path) as f:
+            header = json.loads(f.readline())
+            self.assertEqual(header['corpus']['seed'], 3)
+            return [json.loads(line) for line in f]
+
+    def test_same_seed_gives_same_corpus_for_any_worker_count(self):
+        """Test that output depends only on the seed, not on the process pool"""
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            serial = self.generate(first, workers=1)
+            parallel = self.generate(second, workers=2)
+
+            self.assertEqual(serial, parallel)
+            for entry in serial:
+                with open(os.path.join(first, entry['file']), 'rb') as a, \
+                        open(os.path.join(second, entry['file']), 'rb') as b:
+                    self.assertEqual(a.read(), b.read())
+
+    def test_manifest_ground_truth(self):
+        """Test that each entry has the full text and one bounding box per line"""
+        with tempfile.TemporaryDirectory() as output_dir:
+            entries = self.generate(output_dir, workers=1)
+
+            for entry in entries:
+                self.assertTrue(os.path.exists(os.path.join(output_dir, entry['file'])))
+                self.assertEqual(entry['text'], "\n".join(line['text'] for line in entry['lines']))
+                for line in entry['lines']:
+                    self.assertEqual(len(line['bbox']), 4)
+                    for x, y in line['bbox']:
+                        self.assertTrue(0 <= x <= entry['width'] and 0 <= y <= entry['height'])
+
+    def test_fonts_without_corpus_glyphs_are_skipped(self):
+        """Test that a font is rejected when a character draws as its missing glyph"""
+        fonts = generate_test_corpus.find_fonts()
+        if not fonts:
+            self.skipTest("no TrueType fonts installed")
+
+        self.assertEqual(fonts, sorted(fonts))
+        self.assertTrue(generate_test_corpus.covers_alphabet(fonts[0]))
+        self.assertFalse(generate_test_corpus.covers_alphabet(fonts[0], 'abc\U000e0100'))
+        self.assertFalse(generate_test_corpus.covers_alphabet('/nonexistent/font.ttf'))
+
+    def test_manifest_header_records_fonts(self):
+        """Test that the header lists the fonts used and the benchmark skips it"""
+        fonts = generate_test_corpus.find_fonts()
+        with tempfile.TemporaryDirectory() as output_dir:
+            manifest_path = generate_test_corpus.generate_corpus(3, output_dir, workers=1, fonts=fonts[::-1])
+            with open(manifest_path) as f:
+                header = json.loads(f.readline())['corpus']
+                used = {json.loads(line)['font'] for line in f}
+
+            self.assertEqual(header['fonts'], [os.path.basename(font) for font in fonts] or ['default'])
+            self.assertLessEqual(used, set(header['fonts']))
+            self.assertEqual(len(load_corpus(manifest_path)), 3)
+
+    def test_rotate_point_matches_pillow_expand(self):
+        """Test that the image center maps to the center of the expanded image"""
+        self.assertEqual(generate_test_corpus.rotate_point(50, 20, 30, (100, 40), (107, 85)), [54, 42])
+        self.assertEqual(generate_test_corpus.rotate_point(0, 0, 0, (10, 10), (10, 10)), [0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
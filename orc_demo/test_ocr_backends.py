@@ -0,0 +1,115 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import ocr_backends
+
+TEST_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_image.jpg')
+
+
+class FakeBackend(ocr_backends.OcrBackend):
+
+    def __init__(self, name, cost_per_call, confidence, text='Hello', fail=False):
+        self.name = name
+        self.fail = fail
+        self.cost_per_call = cost_per_call
+        self.confidence = confidence
+        self.text = text
+        self.calls = 0
+
+    def recognize(self, image_path):
+        self.calls += 1
+        if self.fail:
+            return None
+        block = ocr_backends.TextBlock(words=self.text, confidence=self.confidence, location=[])
+        return ocr_backends.OcrResult(direction=0.0, words_block_count=1,
+                                      words_block_list=[block], backend=self.name)
+
+
+class TestRoutedOcrBackend(unittest.TestCase):
+
+    def test_easy_image_stays_local_when_confident(self):
+        """Test that a clean image with a confident local result never reaches the cloud"""
+        local, cloud = FakeBackend('local', 0.0, 0.95), FakeBackend('cloud', 1.0, 0.99)
+        router = ocr_backends.RoutedOcrBackend(local, cloud)
+
+        result = router.recognize(TEST_IMAGE)
+
+        self.assertEqual(result.backend, 'local')
+        self.assertEqual(cloud.calls, 0)
+        self.assertEqual(router.cost, 0.0)
+
+    def test_low_confidence_is_escalated(self):
+        """Test that a low-confidence local result is replaced by the cloud result"""
+        local, cloud = FakeBackend('local', 0.0, 0.4), FakeBackend('cloud', 1.0, 0.99)
+        router = ocr_backends.RoutedOcrBackend(local, cloud)
+
+        result = router.recognize(TEST_IMAGE)
+
+        self.assertEqual(result.backend, 'cloud')
+        self.assertEqual(router.routes['escalated'], 1)
+        self.assertEqual(router.cost, 1.0)
+
+    def test_failed_escalation_falls_back_to_local_result(self):
+        """Test that the low-confidence local result is kept when the cloud call fails"""
+        local, cloud = FakeBackend('local', 0.0, 0.4), FakeBackend('cloud', 1.0, 0.99, fail=True)
+        router = ocr_backends.RoutedOcrBackend(local, cloud)
+
+        result = router.recognize(TEST_IMAGE)
+
+        self.assertEqual(result.backend, 'local')
+        self.assertEqual(cloud.calls, 1)
+        self.assertEqual(router.routes['fallback'], 1)
+        self.assertEqual(router.routes['escalated'], 0)
+
+    def test_hard_image_goes_to_cloud(self):
+        """Test that images below the contrast threshold skip the local engine"""
+        local, cloud = FakeBackend('local', 0.0, 0.95), FakeBackend('cloud', 1.0, 0.99)
+        router = ocr_backends.RoutedOcrBackend(local, cloud, easy_threshold=1.1)
+
+        router.recognize(TEST_IMAGE)
+
+        self.assertEqual(local.calls, 0)
+        self.assertEqual(router.routes['cloud'], 1)
+
+
+class TestTesseractBackend(unittest.TestCase):
+
+    def test_words_are_grouped_into_line_blocks(self):
+        """Test that image_to_data rows become one block per line with 0..1 confidences"""
+        data = {
+            'text': ['Hello', 'World', '', 'Second', 'noise'],
+            'conf': ['90', 70, '-1', 80.0, -1],
+            'block_num': [1, 1, 1, 1, 1],
+            'par_num': [1, 1, 1, 1, 1],
+            'line_num': [1, 1, 1, 2, 2],
+            'left': [10, 80, 0, 12, 200],
+            'top': [5, 7, 0, 40, 40],
+            'width': [60, 50, 0, 70, 10],
+            'height': [20, 20, 0, 22, 10],
+        }
+        fake = SimpleNamespace(image_to_data=lambda image, **kwargs: data, Output=SimpleNamespace(DICT='dict'))
+
+        with patch.object(ocr_backends, 'pytesseract', fake):
+            result = ocr_backends.TesseractBackend().recognize(TEST_IMAGE)
+
+        self.assertEqual(result.backend, 'local')
+        self.assertEqual(result.words_block_count, 2)
+        first, second = result.words_block_list
+        self.assertEqual(first.words, 'Hello World')
+        self.assertAlmostEqual(first.confidence, 0.8)
+        self.assertEqual(first.location, [[10, 5], [130, 5], [130, 27], [10, 27]])
+        self.assertEqual(second.words, 'Second')
+        self.assertAlmostEqual(second.confidence, 0.8)
+
+    def test_base_class_is_abstract(self):
+        """Test that a backend without recognize() cannot be instantiated"""
+        with self.assertRaises(TypeError):
+            ocr_backends.OcrBackend()
+
+
+if __name__ == '__main__':
+    unittest.main()
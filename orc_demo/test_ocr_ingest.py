@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import shutil
+import json
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import ocr_ingest
+
+
+class TestOcrIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.watch_dir = os.path.join(self.work_dir, 'in')
+        self.output_dir = os.path.join(self.work_dir, 'out')
+        os.makedirs(self.watch_dir)
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def recognize(self, image_base64):
+        self.calls.append(image_base64)
+        return {'words_block_count': 0, 'words_block_list': []}
+
+    def write_image(self, name, data):
+        with open(os.path.join(self.watch_dir, name), 'wb') as f:
+            f.write(data)
+
+    def run_once(self):
+        pipeline = ocr_ingest.IngestPipeline(self.watch_dir, self.output_dir, self.recognize,
+                                             workers=2, queue_size=1)
+        with patch('builtins.print'):
+            pipeline.run(run_once=True)
+        return pipeline
+
+    def test_only_new_or_changed_files_are_processed(self):
+        """Test that the state database skips files whose content was already processed"""
+        self.write_image('a.jpg', b'first')
+        self.write_image('b.png', b'second')
+        self.write_image('notes.txt', b'ignored')
+        self.run_once()
+        self.assertEqual(len(self.calls), 2)
+
+        # Rewrite a.jpg with identical content and change b.png
+        self.write_image('a.jpg', b'first')
+        self.write_image('b.png', b'changed')
+        pipeline = self.run_once()
+
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(pipeline.stats.counters['processed'], 1)
+        self.assertEqual(pipeline.stats.counters['skipped'], 1)
+
+    def test_failed_files_are_retried(self):
+        """Test that an unchanged file whose OCR failed is processed again on the next run"""
+        self.write_image('a.jpg', b'first')
+        working = self.recognize
+        self.recognize = lambda image_base64: None
+        self.run_once()
+
+        self.recognize = working
+        pipeline = self.run_once()
+
+        self.assertEqual(pipeline.stats.counters['processed'], 1)
+        self.assertEqual(pipeline.stats.counters['skipped'], 0)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'a.jpg.json')))
+
+    def test_results_are_written_as_json(self):
+        """Test that every processed image produces a JSON result file"""
+        self.write_image('scan.jpg', b'image bytes')
+        self.run_once()
+
+        with open(os.path.join(self.output_dir, 'scan.jpg.json')) as f:
+            output = json.load(f)
+        self.assertEqual(output['source'], os.path.join(self.watch_dir, 'scan.jpg'))
+        self.assertIn('result', output)
+
+    def test_images_sharing_a_stem_keep_separate_results(self):
+        """Test that scan.jpg and scan.png each get their own result file"""
+        self.write_image('scan.jpg', b'jpeg bytes')
+        self.write_image('scan.png', b'png bytes')
+        self.run_once()
+
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ['scan.jpg.json', 'scan.png.json'])
+        for name in ('scan.jpg', 'scan.png'):
+            with open(os.path.join(self.output_dir, name + '.json')) as f:
+                self.assertEqual(json.load(f)['source'], os.path.join(self.watch_dir, name))
+
+    def test_polling_watcher_waits_for_stable_files(self):
+        """Test that the polling watcher reports a new file once it stops changing"""
+        watcher = ocr_ingest.PollingWatcher(self.watch_dir)
+        self.write_image('late.jpg', b'data')
+
+        self.assertEqual(watcher.poll(0), [])
+        self.assertEqual(watcher.poll(0), [os.path.join(self.watch_dir, 'late.jpg')])
+        self.assertEqual(watcher.poll(0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
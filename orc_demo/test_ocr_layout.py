@@ -0,0 +1,122 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import ocr_layout
+
+
+def block(words, x0, y0, x1, y1, confidence=0.9):
+    return {
+        'words': words,
+        'location': [[x0, y0], [x1, y0], [x1, y1], [x0, y1]],
+        'confidence': confidence,
+    }
+
+
+class TestOcrLayout(unittest.TestCase):
+
+    def test_words_are_joined_into_lines_in_reading_order(self):
+        """Test that shuffled blocks are rebuilt into left-to-right, top-to-bottom lines"""
+        blocks = [
+            block('World', 70, 0, 130, 20),
+            block('Line', 0, 40, 40, 60),
+            block('Hello', 0, 0, 60, 20),
+            block('two', 50, 41, 80, 61),
+        ]
+        layout = ocr_layout.reconstruct_layout(blocks)
+
+        self.assertEqual([line.text for line in layout.lines], ['Hello World', 'Line two'])
+
+    def test_columns_are_read_one_after_another(self):
+        """Test that a two-column page is read column by column, not row by row"""
+        blocks = [
+            block('left1', 0, 0, 100, 20),
+            block('right1', 140, 0, 240, 20),
+            block('left2', 0, 30, 100, 50),
+            block('right2', 140, 30, 240, 50),
+        ]
+        layout = ocr_layout.reconstruct_layout(blocks)
+
+        self.assertEqual(layout.region_count, 2)
+        self.assertEqual([line.text for line in layout.lines], ['left1', 'left2', 'right1', 'right2'])
+        self.assertEqual(layout.text, "left1\nleft2\n\nright1\nright2")
+
+    def test_spanning_heading_does_not_join_columns(self):
+        """Test that a heading over two columns is read first and the columns stay separate"""
+        blocks = [
+            block('right2', 140, 60, 240, 80),
+            block('left1', 0, 30, 100, 50),
+            block('TITLE', 0, 0, 240, 20),
+            block('right1', 140, 30, 240, 50),
+            block('left2', 0, 60, 100, 80),
+        ]
+        layout = ocr_layout.reconstruct_layout(blocks)
+
+        self.assertEqual(layout.region_count, 3)
+        self.assertEqual([line.text for line in layout.lines], ['TITLE', 'left1', 'left2', 'right1', 'right2'])
+
+    def test_receipt_columns_are_read_row_by_row(self):
+        """Test that items and prices on shared baselines are read as table rows"""
+        blocks = [
+            block('5.75', 200, 61, 240, 81),
+            block('Coffee', 0, 0, 60, 20),
+            block('2.25', 200, 29, 240, 49),
+            block('Bagel', 0, 30, 55, 50),
+            block('3.50', 200, 1, 240, 21),
+            block('Total', 0, 60, 50, 80),
+        ]
+        layout = ocr_layout.reconstruct_layout(blocks)
+
+        self.assertEqual(layout.region_count, 1)
+        self.assertEqual([line.text for line in layout.lines], ['Coffee', '3.50', 'Bagel', '2.25', 'Total', '5.75'])
+
+    def test_line_confidence_is_weighted_by_characters(self):
+        """Test that per-line confidence weights each block by its text length"""
+        blocks = [
+            block('a', 0, 0, 10, 20, confidence=0.5),
+            block('bbb', 20, 0, 50, 20, confidence=1.0),
+        ]
+        layout = ocr_layout.reconstruct_layout(blocks)
+
+        self.assertEqual(len(layout.lines), 1)
+        self.assertAlmostEqual(layout.lines[0].confidence, (0.5 + 3 * 1.0) / 4)
+
+    def test_partial_or_missing_locations_do_not_reach_the_origin(self):
+        """Test that short locations use only their points and missing ones are read last"""
+        blocks = [
+            {'words': 'nowhere', 'confidence': 0.7},
+            block('Hello', 100, 100, 160, 120),
+            {'words': 'World', 'location': [[170, 100], [200, 120]], 'confidence': 0.9},
+            block('Far', 0, 0, 30, 20),
+        ]
+        layout = ocr_layout.reconstruct_layout(blocks)
+
+        self.assertEqual([line.text for line in layout.lines], ['Far', 'Hello World', 'nowhere'])
+        self.assertEqual(layout.lines[1].box, (100.0, 100.0, 200.0, 120.0))
+        self.assertIsNone(layout.lines[2].box)
+        self.assertEqual(layout.lines[2].block_indices, [0])
+        self.assertEqual(layout.lines[2].region, layout.region_count - 1)
+
+    def test_grid_index_pairs_match_overlapping_boxes(self):
+        """Test that the grid index only pairs boxes sharing a cell"""
+        boxes = ocr_layout.np.array([
+            [0, 0, 10, 10],
+            [5, 5, 15, 15],
+            [100, 100, 110, 110],
+        ], dtype=float)
+        index = ocr_layout.GridIndex(boxes, cell_size=20)
+
+        self.assertEqual(index.candidate_pairs().tolist(), [[0, 1]])
+        self.assertEqual(index.query([95, 95, 120, 120]).tolist(), [2])
+
+    def test_empty_block_list(self):
+        """Test that an empty page produces an empty layout"""
+        layout = ocr_layout.reconstruct_layout([])
+
+        self.assertEqual(layout.lines, [])
+        self.assertEqual(layout.text, "")
+
+
+if __name__ == '__main__':
+    unittest.main()